@@ -1,6 +1,6 @@
 
 import streamlit as st
-from utils import initialize_app_state
+from utils import initialize_app_state, save_register, save_session_state, show_register_conflict
 from utils import go_to_page  # Import the navigation helper
 
 st.set_page_config(page_title="QuLab", layout="wide")
@@ -10,6 +10,7 @@ st.title("QuLab: AI Model Risk Assessment Simulator")
 st.divider()
 
 initialize_app_state()
+show_register_conflict()
 
 
 # Page names for navigation
@@ -69,6 +70,11 @@ elif page_selection == "Final AI Risk Report":
     from application_pages.page_9_final_report import main
     main()
 
+# Persist this run's register and session state changes (a page calling
+# st.rerun() is saved by the rerun).
+save_register()
+save_session_state()
+
 
 # License
 st.caption('''
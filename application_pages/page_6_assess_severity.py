@@ -1,6 +1,6 @@
 
 import streamlit as st
-from utils import assess_risk_severity, go_to_page  # Import the navigation helper
+from utils import assess_risk_severity, auto_assess_risks, get_risk, get_risk_register_df, get_risk_scale, get_sorted_risk_register_df, go_to_page, render_version_controls, risk_search_picker, show_register_table, show_risk_dependencies  # Import the navigation helper
 
 
 def main():
@@ -10,65 +10,43 @@ def main():
     """)
 
     if st.button("Auto-Assess Key Risks", key="auto_assess_btn"):
-        assess_risk_severity("R002", "High", "Medium")  # Historical data bias
-        assess_risk_severity("R003", "Medium", "High")  # CreditScore Lag
-        assess_risk_severity("R004", "Medium", "Medium")  # Data Privacy
-        assess_risk_severity("R005", "High", "Medium")  # Algorithmic Bias
-        # Accuracy & Reliability
-        assess_risk_severity("R006", "Medium", "Low")
-        # Model Robustness (concept drift)
-        assess_risk_severity("R007", "High", "High")
-        assess_risk_severity("R008", "Medium", "High")  # Interpretability
-        assess_risk_severity("R009", "Medium", "Medium")  # Integration Flaws
-        # AI Supply Chain Vulnerabilities
-        assess_risk_severity("R010", "High", "Low")
-        # Scalability & Performance
-        assess_risk_severity("R011", "Medium", "Medium")
-        # Misuse & Misinterpretation
-        assess_risk_severity("R012", "Medium", "High")
-        # Over-Reliance & Autonomy Creep
-        assess_risk_severity("R013", "High", "Medium")
-        assess_risk_severity("R014", "High", "High")  # Loss of Human Oversight
-        # Absence of AI Ethics Committee
-        assess_risk_severity("R015", "High", "Medium")
-        # Lack of Incident Response Plan
-        assess_risk_severity("R016", "High", "High")
-        # Insufficient training
-        assess_risk_severity("R017", "Medium", "Medium")
+        auto_assess_risks()
         st.rerun()
 
+    risk_register_df = get_risk_register_df()
     st.subheader("AI Risk Register with Assessed Risks (Sorted by Score)")
-    if not st.session_state.risk_register_df.empty:
-        st.dataframe(st.session_state.risk_register_df.sort_values(
-            by="Risk Score", ascending=False), use_container_width=True)
+    if not risk_register_df.empty:
+        show_register_table(get_sorted_risk_register_df(
+            "Risk Score"), key="page6_register")
+        render_version_controls("page6")
     else:
         st.info("No risks to assess yet. Please identify some risks first.")
 
     st.markdown("""
     As a Risk Manager, you can refine the impact and likelihood for any risk based on your deeper analysis.
     """)
-    if not st.session_state.risk_register_df.empty:
-        risk_ids = st.session_state.risk_register_df['Risk ID'].tolist()
-        selected_risk_id = st.selectbox(
-            "Select Risk ID to Assess/Update", options=risk_ids, key="select_risk_id_assess")
+    if not risk_register_df.empty:
+        selected_risk_id = risk_search_picker(
+            "Select Risk ID to Assess/Update", key="select_risk_id_assess")
 
         # Pre-fill current impact/likelihood if a risk is selected
         if selected_risk_id:
-            current_risk = st.session_state.risk_register_df[
-                st.session_state.risk_register_df['Risk ID'] == selected_risk_id].iloc[0]
-            current_impact_idx = ["Low", "Medium", "High"].index(
+            current_risk = get_risk(selected_risk_id)
+            scale = get_risk_scale()
+            current_impact_idx = scale.impact_levels.index(
                 current_risk['Potential Impact'])
-            current_likelihood_idx = ["Low", "Medium", "High"].index(
+            current_likelihood_idx = scale.likelihood_levels.index(
                 current_risk['Likelihood'])
 
-            new_impact = st.selectbox("Update Potential Impact", options=[
-                                      "Low", "Medium", "High"], index=current_impact_idx, key="update_impact")
-            new_likelihood = st.selectbox("Update Likelihood", options=[
-                                          "Low", "Medium", "High"], index=current_likelihood_idx, key="update_likelihood")
+            new_impact = st.selectbox("Update Potential Impact", options=scale.impact_levels,
+                                      index=current_impact_idx, key="update_impact")
+            new_likelihood = st.selectbox("Update Likelihood", options=scale.likelihood_levels,
+                                          index=current_likelihood_idx, key="update_likelihood")
             if st.button("Update Risk Severity"):
                 assess_risk_severity(
                     selected_risk_id, new_impact, new_likelihood)
                 st.rerun()
+        show_risk_dependencies("page6")
     else:
         st.warning("Please add risks to the register first to enable assessment.")
 
@@ -1,6 +1,6 @@
 
 import streamlit as st
-from utils import plot_risk_matrix, go_to_page  # Import the navigation helper
+from utils import chart_renderer_toggle, plot_risk_matrix, get_risk_register_df, go_to_page  # Import the navigation helper
 
 
 def main():
@@ -8,8 +8,10 @@ def main():
     st.markdown("""
     To effectively communicate the risk landscape to senior management and other stakeholders, a visual representation is essential. As a Risk Manager, you'll create a Risk Matrix, plotting each identified risk based on its assessed impact and likelihood. This visualization quickly highlights high-priority risks that fall into the "High Impact, High Likelihood" quadrant, enabling a clear and concise presentation for your upcoming 'Effective Challenge' meeting.
     """)
-    if not st.session_state.risk_register_df.empty:
-        plot_risk_matrix(st.session_state.risk_register_df)
+    risk_register_df = get_risk_register_df()
+    if not risk_register_df.empty:
+        chart_renderer_toggle("page7_renderer_toggle")
+        plot_risk_matrix(risk_register_df)
         st.markdown(r"""
         The Risk Matrix visually groups risks, making it immediately clear which ones reside in the high-risk "red" zone (High Impact, High Likelihood). You can quickly point out risks like R007 ("Model Robustness"), R014 ("Loss of Human Oversight"), and R016 ("Lack of Incident Response Plan") as top priorities. This visual summary is an invaluable tool for driving discussions with non-technical stakeholders and securing resources for mitigation.
         """)
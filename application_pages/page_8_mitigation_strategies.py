@@ -1,7 +1,7 @@
 
 import streamlit as st
 # Import the navigation helper
-from utils import add_mitigation_strategy, go_to_page
+from utils import add_mitigation_strategy, auto_mitigate_risks, get_risk, get_risk_register_df, get_sorted_risk_register_df, go_to_page, render_version_controls, risk_search_picker, show_register_table
 
 
 def main():
@@ -11,24 +11,15 @@ def main():
     """)
 
     if st.button("Auto-Populate Mitigations for Top Risks", key="auto_mitigate_btn"):
-        add_mitigation_strategy(
-            "R007", "Implement continuous monitoring for concept drift (e.g., population stability index) with quarterly model re-calibration or re-training. Develop a champion-challenger framework.", "Model Monitoring Team")
-        add_mitigation_strategy(
-            "R014", "Establish clear 'human-in-the-loop' checkpoints for all high-value loan decisions and edge cases. Mandate model explanation training for loan officers.", "Operations & Compliance")
-        add_mitigation_strategy(
-            "R016", "Develop and socialize a comprehensive AI model incident response plan, including clear communication protocols, rollback procedures, and stakeholder notification processes.", "Risk Management & IT Operations")
-        add_mitigation_strategy(
-            "R002", "Conduct regular fairness audits across protected groups. Explore data augmentation or re-sampling techniques to debias training data. Implement post-processing bias mitigation techniques.", "Data Science & AI Ethics Committee")
-        add_mitigation_strategy(
-            "R005", "Implement disparate impact testing during model validation. Use fairness-aware training algorithms or re-weighing techniques. Document fairness metrics in model card.", "Model Validation & Data Science")
-        add_mitigation_strategy(
-            "R015", "Propose the formation of a cross-functional AI Ethics Committee to guide policy, review high-risk models, and provide an 'effective challenge' on ethical considerations.", "Senior Management & Governance")
+        auto_mitigate_risks()
         st.rerun()
 
+    risk_register_df = get_risk_register_df()
     st.subheader("AI Risk Register with Proposed Mitigations (Top Risks)")
-    if not st.session_state.risk_register_df.empty:
-        st.dataframe(st.session_state.risk_register_df.sort_values(
-            by="Risk Score", ascending=False), use_container_width=True)
+    if not risk_register_df.empty:
+        show_register_table(get_sorted_risk_register_df(
+            "Risk Score"), key="page8_register")
+        render_version_controls("page8")
     else:
         st.info(
             "No risks with mitigations yet. Please identify and assess risks first.")
@@ -36,15 +27,13 @@ def main():
     st.markdown("""
     As a Risk Manager, you can add or update mitigation strategies for individual risks.
     """)
-    if not st.session_state.risk_register_df.empty:
-        risk_ids = st.session_state.risk_register_df['Risk ID'].tolist()
-        selected_risk_id_mitigate = st.selectbox(
-            "Select Risk ID to Add/Update Mitigation", options=risk_ids, key="select_risk_id_mitigate")
+    if not risk_register_df.empty:
+        selected_risk_id_mitigate = risk_search_picker(
+            "Select Risk ID to Add/Update Mitigation", key="select_risk_id_mitigate")
 
         # Pre-fill current mitigation/party if a risk is selected
         if selected_risk_id_mitigate:
-            current_mitigation = st.session_state.risk_register_df[
-                st.session_state.risk_register_df['Risk ID'] == selected_risk_id_mitigate].iloc[0]
+            current_mitigation = get_risk(selected_risk_id_mitigate)
             current_strategy = current_mitigation['Mitigation Strategy'] if current_mitigation[
                 'Mitigation Strategy'] != "To be determined" else ""
             current_party = current_mitigation['Responsible Party'] if current_mitigation['Responsible Party'] != "TBD" else ""
@@ -1,7 +1,7 @@
 
 import streamlit as st
 # Import the navigation helper
-from utils import generate_risk_register_report, plot_risk_distribution, go_to_page
+from utils import chart_renderer_toggle, generate_risk_register_report, show_audit_trail, plot_risk_distribution, go_to_page, show_register_rollups, show_register_table, show_score_trends
 
 
 def main():
@@ -11,12 +11,17 @@ def main():
     """)
     st.subheader(
         "Comprehensive AI Model Risk Register: Credit Risk Scoring Model")
-    final_ai_risk_register = generate_risk_register_report(
-        st.session_state.risk_register_df)
-    st.dataframe(final_ai_risk_register, use_container_width=True)
+    final_ai_risk_register = generate_risk_register_report()
+    show_register_table(final_ai_risk_register, key="page9_register")
+    show_audit_trail()
 
     st.subheader("Risk Distribution Across AI Dimensions")
+    chart_renderer_toggle("page9_renderer_toggle")
     plot_risk_distribution(final_ai_risk_register)
+    show_register_rollups()
+
+    st.subheader("Risk Score Trends")
+    show_score_trends("page9")
     st.markdown("""
     The generated table represents the complete AI Risk Register, a critical deliverable. It provides a clear, sortable overview of all identified and assessed risks, along with their proposed mitigation strategies and responsible parties. The bar chart further aids in understanding the overall risk exposure, quickly showing which dimensions (e.g., Model, Data, Human) have the highest number of identified risks. This document is now ready for presentation, audit, and ongoing management, fulfilling a core requirement of both SR 11-7 and NIST AI RMF.
     """)
@@ -0,0 +1,101 @@
+"""Benchmark the risk matrix layout against the original per-cell loop.
+
+Run from the repository root:
+
+    python benchmarks/bench_risk_matrix.py
+
+For each register size it checks that both layouts give identical
+coordinates and prints the time per call. The vectorized layout should
+grow linearly with the number of assessed risks. It then times a fresh
+(uncached) PNG render of the scatter matrix, which draws only the data
+layer over the pre-rendered background.
+"""
+import os
+import sys
+import timeit
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from risk_register import RiskRegister  # noqa: E402
+from risk_scale import DEFAULT_SCALE  # noqa: E402
+from utils import (  # noqa: E402
+    CHART_DPI, RISK_MATRIX_FIGSIZE, _draw_risk_matrix, _render_png, _risk_matrix_layout
+)
+
+
+def loop_layout(risk_df, scale):
+    """The layout as plot_risk_matrix computed it before vectorization."""
+    risk_df_plot = risk_df.copy()
+    risk_df_plot = risk_df_plot[risk_df_plot['Risk Score'] > 0]
+    risk_df_plot["Impact_Num"] = risk_df_plot["Potential Impact"].astype(object).apply(
+        lambda x: scale.impact_levels.index(x) + 0.5)
+    risk_df_plot["Likelihood_Num"] = risk_df_plot["Likelihood"].astype(object).apply(
+        lambda x: scale.likelihood_levels.index(x) + 0.5)
+    risk_df_plot["offset_x"] = 0.0
+    risk_df_plot["offset_y"] = 0.0
+    grouped = risk_df_plot.groupby(['Likelihood_Num', 'Impact_Num'], sort=False)
+    for (lik, imp), group in grouped:
+        n_points = len(group)
+        if n_points > 1:
+            angles = np.linspace(0, 2 * np.pi, n_points, endpoint=False)
+            offsets_x = 0.2 * np.cos(angles)
+            offsets_y = 0.2 * np.sin(angles)
+            for i, idx in enumerate(group.index):
+                risk_df_plot.loc[idx, "offset_x"] = offsets_x[i]
+                risk_df_plot.loc[idx, "offset_y"] = offsets_y[i]
+    risk_df_plot["Likelihood_Num"] = risk_df_plot["Likelihood_Num"] + risk_df_plot["offset_x"]
+    risk_df_plot["Impact_Num"] = risk_df_plot["Impact_Num"] + risk_df_plot["offset_y"]
+    return risk_df_plot
+
+
+def make_register(n, seed=0):
+    rng = np.random.default_rng(seed)
+    levels = np.array(DEFAULT_SCALE.impact_levels)
+    register = RiskRegister(DEFAULT_SCALE)
+    register.add_risks(pd.DataFrame({
+        "dimension": "Model",
+        "category": "Benchmark",
+        "description": [f"Risk {i}" for i in range(n)],
+        "potential_impact": levels[rng.integers(0, len(levels), n)],
+        "likelihood": levels[rng.integers(0, len(levels), n)],
+    }).to_dict("records"))
+    return register.df
+
+
+def main(sizes=(100, 1_000, 10_000)):
+    print(f"{'risks':>8} {'loop (ms)':>12} {'vectorized (ms)':>16}")
+    for n in sizes:
+        risk_df = make_register(n)
+        expected = loop_layout(risk_df, DEFAULT_SCALE)
+        actual = _risk_matrix_layout(risk_df, DEFAULT_SCALE)
+        for column in ("Likelihood_Num", "Impact_Num"):
+            np.testing.assert_array_equal(
+                actual[column].to_numpy(), expected[column].to_numpy())
+
+        loop_ms = 1000 * min(timeit.repeat(
+            lambda: loop_layout(risk_df, DEFAULT_SCALE), number=1, repeat=3))
+        vectorized_ms = 1000 * min(timeit.repeat(
+            lambda: _risk_matrix_layout(risk_df, DEFAULT_SCALE), number=10, repeat=3)) / 10
+        print(f"{n:>8} {loop_ms:>12.1f} {vectorized_ms:>16.2f}")
+
+    for n in (100_000, 1_000_000):
+        risk_df = make_register(n)
+        vectorized_ms = 1000 * min(timeit.repeat(
+            lambda: _risk_matrix_layout(risk_df, DEFAULT_SCALE), number=1, repeat=3))
+        print(f"{n:>8} {'-':>12} {vectorized_ms:>16.2f}")
+
+    print(f"\n{'risks':>8} {'fresh render (ms)':>18}")
+    for n in (20, 200):
+        layout = _risk_matrix_layout(make_register(n), DEFAULT_SCALE)
+        render_ms = 1000 * min(timeit.repeat(
+            lambda: _render_png(_draw_risk_matrix, layout, DEFAULT_SCALE,
+                                figsize=RISK_MATRIX_FIGSIZE, dpi=CHART_DPI),
+            number=1, repeat=3))
+        print(f"{n:>8} {render_ms:>18.0f}")
+
+
+if __name__ == "__main__":
+    main()
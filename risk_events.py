@@ -0,0 +1,132 @@
+"""Append-only audit events for register changes, with snapshots for fast replay.
+
+With `log_events` set, a `RiskRegister` emits one `RiskEvent` per write:
+adding, assessing, mitigating and removing risks, undo and redo, and
+dependency edits. Each event carries the effect of the write (the rows
+inserted, the new values, the Risk IDs removed), not just the call that made
+it. That makes every event self-contained: replaying a log from any snapshot
+rebuilds the same register without needing its undo history.
+
+A snapshot is the whole register state (rows, assessment history, dependency
+edges and next Risk ID) as Arrow IPC bytes. Reloading reads the latest
+snapshot and replays only the events after it, so reload time does not grow
+with the age of the register.
+"""
+import io
+import json
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from risk_history import HISTORY_COLUMNS
+
+
+# Write a snapshot once this many events have been logged since the last one.
+SNAPSHOT_INTERVAL = 1000
+
+# Event operations and what the event's `data` holds for each:
+#   "insert"   {column: [values]} for every register column
+#   "update"   {"Risk ID": [ids], column: [values] or one value for all}
+#   "delete"   {"Risk ID": [ids]}
+#   "reinsert" {"position": int, column: [value]} (undoing a removal)
+#   "depend"   {"parent": id, "child": id, "weight": float}
+#   "undepend" {"parent": id, "child": id}
+
+
+class RiskEvent:
+    """One register write: when, which user-level action, and its effect."""
+
+    __slots__ = ("timestamp", "action", "operation", "data")
+
+    def __init__(self, timestamp, action, operation, data):
+        self.timestamp = timestamp
+        self.action = action
+        self.operation = operation
+        self.data = data
+
+    def __repr__(self):
+        return f"RiskEvent({self.action!r}, {self.operation!r}, {self.risk_ids()})"
+
+    def risk_ids(self):
+        if "Risk ID" in self.data:
+            return list(self.data["Risk ID"])
+        return [self.data[key] for key in ("parent", "child") if key in self.data]
+
+    def encode(self):
+        """The event's data as compact JSON."""
+        return json.dumps(self.data, separators=(",", ":"), default=_json_default)
+
+    @classmethod
+    def decode(cls, timestamp, action, operation, payload):
+        return cls(timestamp, action, operation, json.loads(payload))
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"Cannot encode {type(value).__name__} in a risk event.")
+
+
+def column_values(values):
+    """JSON-ready form of a column of values, or of one value shared by all rows."""
+    if isinstance(values, (np.ndarray, pd.Series, pd.Index, pd.Categorical, list)):
+        return pd.Series(values).astype(object).tolist()
+    return values.item() if isinstance(values, np.generic) else values
+
+
+def _summarize(risk_ids, limit=10):
+    text = ", ".join(map(str, risk_ids[:limit]))
+    if len(risk_ids) > limit:
+        text += f", ... ({len(risk_ids)} risks)"
+    return text
+
+
+def events_frame(events):
+    """An audit table of (sequence, event) pairs: Seq, Time, Action, Risk IDs and Fields.
+
+    Fields lists the columns an update wrote; it is empty for other events.
+    """
+    records = [(seq, event.timestamp, event.action, _summarize(event.risk_ids()),
+                ", ".join(key for key in event.data if key != "Risk ID")
+                if event.operation == "update" else "")
+               for seq, event in events]
+    frame = pd.DataFrame.from_records(
+        records, columns=["Seq", "Time", "Action", "Risk IDs", "Fields"])
+    frame["Time"] = pd.to_datetime(frame["Time"], unit="ns")
+    return frame
+
+
+def _ipc_bytes(table):
+    sink = io.BytesIO()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue()
+
+
+def _read_ipc(data):
+    return pa.ipc.open_stream(data).read_all()
+
+
+def encode_snapshot(register):
+    """The register's full state as a dict of bytes fields, ready to store."""
+    history = {name: register.history.column(name) for name in HISTORY_COLUMNS}
+    return {
+        "rows": _ipc_bytes(pa.Table.from_pandas(register.df, preserve_index=False)),
+        "history": _ipc_bytes(pa.table(history)),
+        "meta": json.dumps({
+            "next_risk_id": register.next_risk_id,
+            "dependencies": register.dependencies.edges(),
+        }).encode(),
+    }
+
+
+def decode_snapshot(snapshot):
+    """(rows DataFrame, history columns, next Risk ID, dependency edges) from `encode_snapshot` output."""
+    rows = _read_ipc(snapshot["rows"]).to_pandas()
+    history = _read_ipc(snapshot["history"])
+    meta = json.loads(snapshot["meta"])
+    history = {name: history.column(name).to_numpy() for name in HISTORY_COLUMNS}
+    return rows, history, meta["next_risk_id"], [tuple(edge) for edge in meta["dependencies"]]
@@ -0,0 +1,151 @@
+"""Dependencies between risks and the scores they propagate.
+
+A `RiskGraph` holds weighted edges parent -> child between Risk IDs, meaning
+the parent risk feeds the child. Each risk in the graph has an effective score
+
+    effective(child) = max(own score, max over parents of weight * effective(parent))
+
+so a severe upstream risk raises the risks it feeds. Edges must not form a
+cycle. Score changes are only marked when they happen; the next read
+recomputes just the risks downstream of the marked ones, in topological
+order, and stops early along any path where an effective score did not change.
+"""
+from collections import deque
+
+
+DEFAULT_DEPENDENCY_WEIGHT = 1.0
+
+# Known causal links between the credit model's initial risks (see
+# page 5): Data Bias feeds Algorithmic Bias & Fairness, and the lagging
+# CreditScore data feeds Model Robustness.
+CREDIT_MODEL_DEPENDENCIES = [
+    ("R002", "R005", DEFAULT_DEPENDENCY_WEIGHT),
+    ("R003", "R007", DEFAULT_DEPENDENCY_WEIGHT),
+]
+
+
+class RiskGraphError(ValueError):
+    """Raised for self-dependencies, cycles and invalid weights."""
+
+
+class RiskGraph:
+    """Weighted parent -> child edges between Risk IDs with incrementally propagated scores."""
+
+    def __init__(self, edges=()):
+        self._children = {}
+        self._parents = {}
+        self._effective = {}
+        self._dirty = set()
+        for parent, child, weight in edges:
+            self.add_edge(parent, child, weight)
+
+    def __contains__(self, risk_id):
+        return risk_id in self._children or risk_id in self._parents
+
+    def __len__(self):
+        return sum(len(children) for children in self._children.values())
+
+    def edges(self):
+        """Every edge as a (parent, child, weight) tuple."""
+        return [(parent, child, weight)
+                for parent, children in self._children.items()
+                for child, weight in children.items()]
+
+    def parents(self, risk_id):
+        return dict(self._parents.get(risk_id, {}))
+
+    def children(self, risk_id):
+        return dict(self._children.get(risk_id, {}))
+
+    def add_edge(self, parent, child, weight=DEFAULT_DEPENDENCY_WEIGHT):
+        """Add or reweight the edge parent -> child."""
+        if parent == child:
+            raise RiskGraphError(f"Risk {parent} cannot depend on itself.")
+        if not weight >= 0:
+            raise RiskGraphError(f"Invalid dependency weight {weight}.")
+        if parent in self.downstream([child]):
+            raise RiskGraphError(
+                f"{parent} -> {child} would create a dependency cycle.")
+        self._children.setdefault(parent, {})[child] = float(weight)
+        self._parents.setdefault(child, {})[parent] = float(weight)
+        self._dirty.update((parent, child))
+
+    def remove_edge(self, parent, child):
+        """Remove the edge parent -> child; returns False if there was none."""
+        if child not in self._children.get(parent, {}):
+            return False
+        del self._children[parent][child]
+        del self._parents[child][parent]
+        for risk_id, adjacency in ((parent, self._children), (child, self._parents)):
+            if not adjacency[risk_id]:
+                del adjacency[risk_id]
+        for risk_id in (parent, child):
+            if risk_id not in self:
+                self._effective.pop(risk_id, None)
+                self._dirty.discard(risk_id)
+        if child in self:
+            self._dirty.add(child)
+        return True
+
+    def mark(self, risk_ids):
+        """Note that the own score of `risk_ids` changed (or the risks came or went)."""
+        self._dirty.update(risk_id for risk_id in risk_ids if risk_id in self)
+
+    def downstream(self, risk_ids):
+        """`risk_ids` and every risk reachable from them."""
+        seen = set(risk_ids)
+        stack = list(seen)
+        while stack:
+            for child in self._children.get(stack.pop(), ()):
+                if child not in seen:
+                    seen.add(child)
+                    stack.append(child)
+        return seen
+
+    def _topological(self, risk_ids):
+        """`risk_ids` ordered so every risk comes after its parents among them."""
+        indegree = {risk_id: sum(parent in risk_ids for parent in self._parents.get(risk_id, ()))
+                    for risk_id in risk_ids}
+        ready = deque(risk_id for risk_id, degree in indegree.items() if not degree)
+        while ready:
+            risk_id = ready.popleft()
+            yield risk_id
+            for child in self._children.get(risk_id, ()):
+                if child in indegree:
+                    indegree[child] -= 1
+                    if not indegree[child]:
+                        ready.append(child)
+
+    def propagate(self, own_score):
+        """Recompute the effective scores downstream of every marked risk.
+
+        `own_score(risk_id)` returns a risk's own score, or None if the risk
+        is not in the register; such risks have no effective score and pass
+        nothing on. Returns the number of risks recomputed.
+        """
+        recomputed = 0
+        changed = set()
+        for risk_id in self._topological(self.downstream(self._dirty)):
+            parents = self._parents.get(risk_id, {})
+            if risk_id not in self._dirty and changed.isdisjoint(parents):
+                continue
+            recomputed += 1
+            value = own_score(risk_id)
+            if value is not None:
+                value = float(value)
+                for parent, weight in parents.items():
+                    upstream = self._effective.get(parent)
+                    if upstream is not None:
+                        value = max(value, weight * upstream)
+            if value != self._effective.get(risk_id):
+                changed.add(risk_id)
+                if value is None:
+                    del self._effective[risk_id]
+                else:
+                    self._effective[risk_id] = value
+        self._dirty.clear()
+        return recomputed
+
+    def effective_scores(self):
+        """Effective score per Risk ID as of the last `propagate`."""
+        return dict(self._effective)
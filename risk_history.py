@@ -0,0 +1,139 @@
+"""Columnar history of risk ratings.
+
+`AssessmentHistory` is an append-only log with one row per rating a risk
+receives: when it is added and on every later assessment. Each column is a
+typed numpy array grown by doubling, so appending k rows is amortized O(k)
+and reading a column is a slice with no copy. Years of review cycles across
+many risks stay a few bytes per row.
+
+The trend helpers work on the DataFrame from `RiskRegister.assessment_history`
+and are vectorized over the whole history.
+"""
+import time
+
+import numpy as np
+import pandas as pd
+
+
+HISTORY_COLUMNS = {
+    "risk_number": np.int32,
+    "timestamp": np.int64,  # nanoseconds since the epoch, UTC
+    "impact_code": np.int8,
+    "likelihood_code": np.int8,
+    "score": np.int16,
+}
+
+# Period choices for trend charts, as pandas offset aliases.
+TREND_PERIODS = {"Minute": "min", "Hour": "h", "Day": "D",
+                 "Month": "MS", "Quarter": "QS"}
+
+
+class AssessmentHistory:
+    """Append-only columns of (risk number, timestamp, impact code, likelihood code, score)."""
+
+    def __init__(self, capacity=1024):
+        self._size = 0
+        self._columns = {name: np.empty(capacity, dtype=dtype)
+                         for name, dtype in HISTORY_COLUMNS.items()}
+
+    def __len__(self):
+        return self._size
+
+    def _reserve(self, size):
+        capacity = len(self._columns["timestamp"])
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        for name, column in self._columns.items():
+            grown = np.empty(capacity, dtype=column.dtype)
+            grown[:self._size] = column[:self._size]
+            self._columns[name] = grown
+
+    def append(self, risk_numbers, impact_codes, likelihood_codes, scores, timestamp=None):
+        """Append one row per risk.
+
+        `timestamp` (nanoseconds) is one value shared by all rows, one value
+        per row, or None for now.
+        """
+        count = len(risk_numbers)
+        if not count:
+            return
+        self._reserve(self._size + count)
+        end = self._size + count
+        self._columns["risk_number"][self._size:end] = risk_numbers
+        self._columns["timestamp"][self._size:end] = (
+            time.time_ns() if timestamp is None else timestamp)
+        self._columns["impact_code"][self._size:end] = impact_codes
+        self._columns["likelihood_code"][self._size:end] = likelihood_codes
+        self._columns["score"][self._size:end] = scores
+        self._size = end
+
+    def column(self, name):
+        """A read-only view of one column."""
+        view = self._columns[name][:self._size]
+        view.flags.writeable = False
+        return view
+
+    def to_frame(self, scale):
+        """The history as a DataFrame with the register's column names and dtypes."""
+        # Format each distinct Risk ID once rather than once per row
+        numbers, codes = np.unique(self.column("risk_number"), return_inverse=True)
+        return pd.DataFrame({
+            "Risk ID": pd.Categorical.from_codes(
+                codes, [f"R{number:03d}" for number in numbers]),
+            "Timestamp": pd.to_datetime(self.column("timestamp"), unit="ns"),
+            "Potential Impact": pd.Categorical.from_codes(
+                self.column("impact_code"), dtype=scale.impact_dtype),
+            "Likelihood": pd.Categorical.from_codes(
+                self.column("likelihood_code"), dtype=scale.likelihood_dtype),
+            "Risk Score": self.column("score"),
+        })
+
+
+def grouped_rolling_mean(groups, values, window):
+    """Rolling mean of `values` over the last `window` rows of each group.
+
+    Rows of a group must be contiguous and in time order. Computed from one
+    cumulative sum, so the cost is linear in the number of rows whatever the
+    number of groups.
+    """
+    groups = np.asarray(groups)
+    values = np.asarray(values, dtype=np.float64)
+    n = len(values)
+    if not n:
+        return values
+    starts = np.flatnonzero(np.r_[True, groups[1:] != groups[:-1]])
+    group_start = np.repeat(starts, np.diff(np.r_[starts, n]))
+    cumulative = np.r_[0.0, np.cumsum(values)]
+    index = np.arange(n)
+    first = np.maximum(index - window + 1, group_start)
+    return (cumulative[index + 1] - cumulative[first]) / (index + 1 - first)
+
+
+def risk_trends(history_df, window=4):
+    """Each risk's ratings in time order with a rolling mean over its last `window` ratings."""
+    # The history is already in time order, so a stable sort keeps each risk's ratings in order
+    trends = history_df.sort_values("Risk ID", kind="stable")
+    return trends.assign(**{"Rolling Score": grouped_rolling_mean(
+        trends["Risk ID"].cat.codes.to_numpy(), trends["Risk Score"].to_numpy(), window)})
+
+
+def dimension_trends(history_df, period="QS", window=4):
+    """Mean score and rating count per Dimension per period.
+
+    Includes a rolling mean over the dimension's last `window` periods.
+    Returns columns Dimension, Period, Mean Score, Assessments and Rolling
+    Mean Score. Ratings of risks that are no longer in the register have no
+    Dimension and are left out.
+    """
+    summary = (history_df.dropna(subset=["Dimension"])
+               .groupby(["Dimension", pd.Grouper(key="Timestamp", freq=period)],
+                        observed=True)["Risk Score"]
+               .agg(["mean", "size"])
+               .reset_index()
+               .rename(columns={"Timestamp": "Period", "mean": "Mean Score",
+                                "size": "Assessments"}))
+    summary["Rolling Mean Score"] = grouped_rolling_mean(
+        summary["Dimension"].cat.codes.to_numpy(), summary["Mean Score"].to_numpy(), window)
+    return summary
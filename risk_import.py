@@ -0,0 +1,215 @@
+"""Streaming import of risk registers exported from GRC systems.
+
+`import_risks` reads a CSV or Parquet file in chunks of `IMPORT_CHUNK_SIZE`
+rows, so memory use is bounded by the chunk size rather than the file size.
+Only the mapped columns are read. Source columns are matched to register
+fields by `COLUMN_ALIASES` unless an explicit mapping is given.
+
+Each chunk is validated in one vectorized pass. Dimension and the rating
+columns are matched case-insensitively, and ratings may also be given as
+1-based level numbers. Rows that fail validation are skipped and reported.
+The rest are scored and added with a single `RiskRegister.add_risks` call,
+so every chunk is one write and one undo step.
+"""
+import os
+import re
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+from risk_register import RISK_DIMENSIONS, RiskRegisterError
+
+
+IMPORT_CHUNK_SIZE = 20_000
+
+# Register field (an `add_risks` key) -> source column names it is read from,
+# compared ignoring case, spaces and punctuation.
+COLUMN_ALIASES = {
+    "dimension": ["Dimension", "Risk Dimension", "Risk Type", "Taxonomy"],
+    "category": ["Category", "Risk Category", "Subcategory"],
+    "description": ["Description", "Risk Description", "Risk Statement"],
+    "potential_impact": ["Potential Impact", "Impact", "Impact Rating", "Severity"],
+    "likelihood": ["Likelihood", "Likelihood Rating", "Probability"],
+    "mitigation_strategy": ["Mitigation Strategy", "Mitigation", "Treatment", "Control"],
+    "responsible_party": ["Responsible Party", "Owner", "Risk Owner"],
+}
+REQUIRED_FIELDS = ("dimension", "description")
+
+IMPORT_FORMATS = {".csv": "csv", ".txt": "csv", ".parquet": "parquet", ".pq": "parquet"}
+
+# Rejection reasons, in the order they are checked.
+_REASONS = ["Unknown Dimension", "Missing Description", "Unknown Potential Impact",
+            "Unknown Likelihood"]
+
+
+class RiskImportError(RiskRegisterError):
+    """Raised when a file cannot be imported at all (format or required columns)."""
+
+
+class ImportReport:
+    """Progress and outcome of an import, updated after every chunk."""
+
+    def __init__(self):
+        self.rows_read = 0
+        self.rows_imported = 0
+        self.rows_rejected = 0
+        # (file row number, reason) for the first rejected rows.
+        self.rejects = []
+        self.fraction = 0.0
+
+    def rejects_frame(self):
+        return pd.DataFrame.from_records(self.rejects, columns=["Row", "Reason"])
+
+
+def _normalize_name(name):
+    return re.sub(r"[^a-z0-9]", "", str(name).lower())
+
+
+def detect_format(filename):
+    """"csv" or "parquet" from the file extension."""
+    fmt = IMPORT_FORMATS.get(os.path.splitext(str(filename))[1].lower())
+    if fmt is None:
+        raise RiskImportError(
+            f"Cannot import '{filename}': expected one of {', '.join(IMPORT_FORMATS)}.")
+    return fmt
+
+
+def source_columns(source, fmt):
+    """Column names of a CSV or Parquet file (a path or a seekable binary file)."""
+    if fmt == "parquet":
+        columns = pq.ParquetFile(source).schema_arrow.names
+    else:
+        columns = list(pd.read_csv(source, nrows=0).columns)
+    if hasattr(source, "seek"):
+        source.seek(0)
+    return columns
+
+
+def detect_columns(columns):
+    """{field: source column} for the register fields `COLUMN_ALIASES` finds in `columns`."""
+    by_name = {_normalize_name(column): column for column in columns}
+    detected = {}
+    for field, aliases in COLUMN_ALIASES.items():
+        for alias in aliases:
+            column = by_name.get(_normalize_name(alias))
+            if column is not None:
+                detected[field] = column
+                break
+    return detected
+
+
+def map_columns(columns, mapping=None):
+    """{field: source column} for the register fields found in `columns`.
+
+    `mapping` entries take precedence over the detected columns; map a field
+    to None to leave it out. Raises RiskImportError if a required field is
+    unmapped.
+    """
+    mapped = detect_columns(columns)
+    for field, column in (mapping or {}).items():
+        if field not in COLUMN_ALIASES:
+            raise RiskImportError(f"Unknown register field '{field}'.")
+        if column is None:
+            mapped.pop(field, None)
+        elif column not in columns:
+            raise RiskImportError(f"Column '{column}' is not in the file.")
+        else:
+            mapped[field] = column
+    missing = [field for field in REQUIRED_FIELDS if field not in mapped]
+    if missing:
+        raise RiskImportError(
+            f"No column found for {', '.join(missing)}; map it explicitly.")
+    return mapped
+
+
+def _read_chunks(handle, fmt, columns, chunk_size):
+    """(chunk DataFrame of strings, fraction of the file read) pairs."""
+    if fmt == "parquet":
+        parquet = pq.ParquetFile(handle)
+        total, done = parquet.metadata.num_rows, 0
+        for batch in parquet.iter_batches(batch_size=chunk_size, columns=columns):
+            done += batch.num_rows
+            yield batch.to_pandas().astype("string"), done / max(total, 1)
+        return
+    size = handle.seek(0, os.SEEK_END)
+    handle.seek(0)
+    for chunk in pd.read_csv(handle, usecols=columns, dtype="string", chunksize=chunk_size,
+                             keep_default_na=False, na_values=[""]):
+        # The parser reads ahead, so the position is an estimate.
+        yield chunk, min(handle.tell() / max(size, 1), 1.0)
+
+
+def _level_lookup(levels):
+    """Normalized text -> level for level names and 1-based level numbers."""
+    lookup = {level.lower(): level for level in levels}
+    lookup.update((str(i), level) for i, level in enumerate(levels, 1))
+    return lookup
+
+
+def _match(values, lookup):
+    """Canonical values for a column of text (NA where blank or unknown) and a mask of unknown ones."""
+    text = values.str.strip().str.lower().str.removesuffix(".0")
+    blank = text.isna() | text.eq("")
+    matched = text.map(lookup)
+    return matched, (matched.isna() & ~blank).to_numpy(dtype=bool)
+
+
+def prepare_chunk(chunk, mapping, scale):
+    """`add_risks` rows for the valid rows of a chunk, plus a rejection reason code per row (-1 for valid)."""
+    rows = pd.DataFrame({field: chunk[column] for field, column in mapping.items()},
+                        index=chunk.index).reindex(columns=list(COLUMN_ALIASES))
+    for field in ("category", "description", "mitigation_strategy", "responsible_party"):
+        rows[field] = rows[field].astype("string").str.strip()
+    rows["dimension"], bad_dimension = _match(
+        rows["dimension"].astype("string"), {d.lower(): d for d in RISK_DIMENSIONS})
+    bad_dimension |= rows["dimension"].isna().to_numpy(dtype=bool)
+    rows["potential_impact"], bad_impact = _match(
+        rows["potential_impact"].astype("string"), _level_lookup(scale.impact_levels))
+    rows["likelihood"], bad_likelihood = _match(
+        rows["likelihood"].astype("string"), _level_lookup(scale.likelihood_levels))
+    no_description = rows["description"].fillna("").eq("").to_numpy(dtype=bool)
+    reasons = np.select([bad_dimension, no_description, bad_impact, bad_likelihood],
+                        range(len(_REASONS)), default=-1)
+    valid = reasons < 0
+    # Blank cells mean "not given": add_risks fills in defaults for them.
+    valid_rows = rows[valid].astype(object)
+    return valid_rows.where(valid_rows.notna(), None).infer_objects(), reasons
+
+
+def import_risks(register, source, fmt=None, mapping=None, chunk_size=IMPORT_CHUNK_SIZE,
+                 on_chunk=None, max_rejects=100):
+    """Add the risks in a CSV or Parquet file to `register`, one write per chunk.
+
+    `source` is a path or a seekable binary file; `fmt` defaults to the
+    path's extension. `mapping` overrides the detected column mapping (see
+    `map_columns`). `on_chunk(report)` is called after each chunk is added,
+    e.g. to report progress or save the register. Returns the ImportReport.
+    """
+    if fmt is None:
+        fmt = detect_format(getattr(source, "name", source))
+    if fmt not in IMPORT_FORMATS.values():
+        raise RiskImportError(f"Unsupported import format '{fmt}'.")
+    mapping = map_columns(source_columns(source, fmt), mapping)
+    columns = list(dict.fromkeys(mapping.values()))
+    report = ImportReport()
+    handle = open(source, "rb") if isinstance(source, (str, os.PathLike)) else source
+    try:
+        for chunk, fraction in _read_chunks(handle, fmt, columns, chunk_size):
+            rows, reasons = prepare_chunk(chunk, mapping, register.scale)
+            if len(rows):
+                register.add_risks(rows)
+            rejected = np.flatnonzero(reasons >= 0)
+            for i in rejected[:max(max_rejects - len(report.rejects), 0)]:
+                # Data rows are numbered from 1, after the header.
+                report.rejects.append((report.rows_read + i + 1, _REASONS[reasons[i]]))
+            report.rows_read += len(chunk)
+            report.rows_imported += len(rows)
+            report.rows_rejected += len(rejected)
+            report.fraction = fraction
+            if on_chunk is not None:
+                on_chunk(report)
+    finally:
+        if handle is not source:
+            handle.close()
+    return report
@@ -0,0 +1,1090 @@
+"""Headless AI risk register.
+
+`RiskRegister` owns the register data, Risk ID allocation, scoring,
+assessment, mitigation and report generation. It has no Streamlit dependency,
+so the same logic runs in the app, in batch jobs and in worker processes. The
+Streamlit side lives in `utils.py`, which wraps these methods and turns
+`RiskRegisterError` into on-page messages.
+"""
+import bisect
+import time
+import uuid
+
+import numpy as np
+import pandas as pd
+
+from risk_events import RiskEvent, column_values
+from risk_graph import RiskGraph, RiskGraphError
+from risk_history import AssessmentHistory
+from risk_scale import DEFAULT_SCALE
+from risk_search import SEARCH_FIELDS, RiskSearchIndex
+
+
+REGISTER_COLUMNS = [
+    "Risk ID", "Dimension", "Category", "Description",
+    "Potential Impact", "Likelihood", "Risk Score",
+    "Mitigation Strategy", "Responsible Party", "Status"
+]
+
+RISK_DIMENSIONS = ["Data", "Model", "System", "Human", "Organizational"]
+RISK_STATUSES = ["Identified", "Assessed", "Mitigation Proposed"]
+
+# Columns the rollup counters are keyed on.
+_ROLLUP_COLUMNS = frozenset(["Dimension", "Status", "Risk Score"])
+
+DEFAULT_MITIGATION = "To be determined"
+DEFAULT_RESPONSIBLE_PARTY = "TBD"
+
+
+class RiskRegisterError(ValueError):
+    """Raised for unknown Risk IDs or values outside the register schema."""
+
+
+def register_dtypes(scale):
+    """Typed schema for the low-cardinality register columns.
+
+    Categoricals store one small integer code per row, and the ordered rating
+    columns sort and group by those codes rather than by string comparison.
+    """
+    return {
+        "Dimension": pd.CategoricalDtype(RISK_DIMENSIONS),
+        "Potential Impact": scale.impact_dtype,
+        "Likelihood": scale.likelihood_dtype,
+        "Risk Score": scale.score_dtype,
+        "Status": pd.CategoricalDtype(RISK_STATUSES),
+    }
+
+
+def format_risk_id(number):
+    return f"R{number:03d}"
+
+
+def _describe(values, limit=10):
+    return ", ".join(map(str, list(values)[:limit]))
+
+
+def _as_batch(items, columns):
+    """A batch of tuples (or an equivalent DataFrame) as a DataFrame with `columns`."""
+    if isinstance(items, pd.DataFrame):
+        return items.set_axis(columns, axis=1).reset_index(drop=True)
+    return pd.DataFrame.from_records(list(items), columns=columns)
+
+
+def _last_per_risk(batch):
+    """Mask of the batch rows to apply: the last entry for each Risk ID."""
+    return ~batch["risk_id"].duplicated(keep="last").to_numpy()
+
+
+def risk_number(risk_id):
+    return int(risk_id[1:])
+
+
+def build_report(risk_df, order=None):
+    """The final register report: all register columns, highest score first.
+
+    `order` is a precomputed row order (see `RiskRegister.score_order`); ties
+    keep register order.
+    """
+    if order is None:
+        order = np.argsort(-risk_df["Risk Score"].to_numpy(dtype="int64"),
+                           kind="stable")
+    report_df = risk_df[REGISTER_COLUMNS].take(order)
+    report_df.reset_index(drop=True, inplace=True)
+    return report_df
+
+
+class _ScoreOrder:
+    """Row positions ordered by Risk Score, highest first, ties in row order.
+
+    Writes only mark the rows they touch. On the next read the marked rows are
+    pulled out of the previous order, sorted among themselves and merged back
+    in with a binary search, so a read after k writes costs O(n + k log k)
+    rather than a full O(n log n) sort.
+    """
+
+    def __init__(self):
+        self._order = np.empty(0, dtype=np.int64)
+        self._dirty = set()
+        self._stale = False
+
+    def mark(self, positions):
+        self._dirty.update(positions)
+
+    def truncate(self, n):
+        """Drop positions n and above, e.g. after undoing an insert."""
+        self._order = self._order[self._order < n]
+        self._dirty = {pos for pos in self._dirty if pos < n}
+
+    def reset(self):
+        """Forget the order, e.g. after a delete shifts row positions."""
+        self._stale = True
+        self._dirty.clear()
+
+    def order(self, scores):
+        n = len(scores)
+        # Composite key: higher score first, then lower row position.
+        keys = (scores.max(initial=0) - scores.astype(np.int64)) * \
+            (n + 1) + np.arange(n)
+        if self._stale:
+            self._order = np.argsort(keys, kind="stable")
+            self._stale = False
+        elif self._dirty:
+            dirty = np.fromiter(self._dirty, dtype=np.int64,
+                                count=len(self._dirty))
+            is_dirty = np.zeros(n, dtype=bool)
+            is_dirty[dirty] = True
+            clean = self._order[~is_dirty[self._order]]
+            dirty = dirty[np.argsort(keys[dirty])]
+            self._order = np.insert(
+                clean, np.searchsorted(keys[clean], keys[dirty]), dirty)
+        self._dirty.clear()
+        return self._order
+
+
+class _Rollups:
+    """Risk counts by Dimension x Status and Dimension x score band.
+
+    Writes add or subtract the codes of just the rows they touch, so keeping
+    the counts current is O(1) per changed row and reading them never scans
+    the register.
+    """
+
+    def __init__(self, scale):
+        self.scale = scale
+        self.by_status = np.zeros(
+            (len(RISK_DIMENSIONS), len(RISK_STATUSES)), dtype=np.int64)
+        self.by_band = np.zeros(
+            (len(RISK_DIMENSIONS), len(scale.score_bands)), dtype=np.int64)
+
+    @staticmethod
+    def _bincount(table, rows, columns, sign):
+        cells = rows.astype(np.int64) * table.shape[1] + columns
+        table += sign * np.bincount(cells, minlength=table.size).reshape(table.shape)
+
+    def count(self, rows_df, sign=1):
+        """Add (sign=1) or remove (sign=-1) typed register rows."""
+        if rows_df.empty:
+            return
+        dimensions = rows_df["Dimension"].cat.codes.to_numpy()
+        self._bincount(self.by_status, dimensions,
+                       rows_df["Status"].cat.codes.to_numpy(), sign)
+        self._bincount(self.by_band, dimensions,
+                       self.scale.band_codes(rows_df["Risk Score"].to_numpy()), sign)
+
+    def count_one(self, dimension, status, risk_score):
+        dimension = RISK_DIMENSIONS.index(dimension)
+        self.by_status[dimension, RISK_STATUSES.index(status)] += 1
+        self.by_band[dimension, self.scale.band_codes(risk_score)] += 1
+
+
+class _Change:
+    """One undoable write, holding only the rows it touched.
+
+    kind is "insert" (rows appended at `start`), "update" (`before`/`after`
+    column values at `positions`) or "remove" (`rows` deleted from `start`).
+    """
+
+    __slots__ = ("seq", "kind", "start", "positions",
+                 "risk_ids", "before", "after", "rows")
+
+    def __init__(self, kind, risk_ids, start=None, positions=None,
+                 before=None, after=None, rows=None):
+        self.seq = None
+        self.kind = kind
+        self.risk_ids = risk_ids
+        self.start = start
+        self.positions = positions
+        self.before = before
+        self.after = after
+        self.rows = rows
+
+
+class RiskRegister:
+    """The AI risk register for one model.
+
+    New risks are appended to a plain Python buffer, which makes adding a risk
+    amortized O(1). The buffer is folded into the DataFrame with a single
+    concat the next time the register is read, so building a register of n
+    risks costs O(n) instead of O(n^2).
+
+    A Risk ID -> row position index is kept in step with every insert, update
+    and delete, so looking up or editing a single risk is O(1).
+
+    Every write bumps `version`. The orderings the pages show (by Risk ID, by
+    score, and the final report) are materialized once per version and the
+    score order is maintained incrementally, so reruns that do not change the
+    register reuse the same DataFrames instead of re-sorting.
+
+    Each write is also kept as a change record holding only the rows it
+    touched (up to `history_limit` records). Versions share everything else,
+    so `undo`, `redo`, `restore` and `changes_since` cost time proportional
+    to the changed rows, not to the size of the register.
+
+    Methods that change the register raise `RiskRegisterError` and leave the
+    register untouched when any input is invalid.
+
+    `rules` is an optional `risk_rules.RuleSet` used by `auto_assess` and
+    `auto_mitigate`. With `classify_on_insert`, risks added without ratings
+    take their ratings, mitigation and owner from the rules instead of the
+    defaults.
+
+    `dependencies` is an iterable of (parent, child, weight) edges between
+    Risk IDs (see `risk_graph`). Edges may name risks that are not added yet.
+    `effective_scores` propagates Risk Scores along them, recomputing only
+    the risks downstream of those rescored since the last read. Dependency
+    edits are not part of the undo history.
+
+    `search` runs ranked keyword queries over Category, Description and
+    Mitigation Strategy through an inverted index (see `risk_search`). Writes
+    only note which risks changed; they are re-indexed on the next search.
+
+    Storage backends (see `risk_storage`) persist a register incrementally:
+    `unsaved_changes` returns the risks written or removed since the last
+    `mark_saved`, and `from_frame` rebuilds a register from stored rows.
+    With `log_events`, every write also emits a `risk_events.RiskEvent`
+    (see `unsaved_events`), and `apply_events` replays logged events.
+
+    Several registers (one per analyst session) may share one stored
+    register. `id_allocator(count)` then reserves Risk numbers centrally: on
+    its first insert, and whenever its lease runs out, the register leases
+    a block of `id_block_size` numbers and allocates from it locally. Writers
+    thus never hand out the same Risk ID and need no shared lock per insert.
+    IDs are unique but not necessarily contiguous: numbers left in a lease
+    when a session ends or reloads, and those of undone or refused inserts,
+    are never reused.
+    `row_versions`, `synced_seq` and `writer_id` are kept by the store to
+    detect conflicting writes and to pick up other writers' events.
+    """
+
+    _column_positions = {column: i for i,
+                         column in enumerate(REGISTER_COLUMNS)}
+
+    def __init__(self, scale=DEFAULT_SCALE, first_risk_id=1, rules=None, classify_on_insert=False,
+                 history_limit=100, dependencies=(), log_events=False,
+                 id_allocator=None, id_block_size=100):
+        self.scale = scale
+        self.rules = rules
+        self.classify_on_insert = classify_on_insert
+        self._dtypes = register_dtypes(scale)
+        self._frame = pd.DataFrame(
+            columns=REGISTER_COLUMNS).astype(self._dtypes)
+        # Single rows are buffered as dicts; bulk writes arrive as ready-made
+        # DataFrame chunks. Rows are folded into a chunk before the next bulk
+        # write so insertion order is preserved.
+        self._pending_rows = []
+        self._pending_chunks = []
+        self._pending_count = 0
+        self._positions = {}
+        self.next_risk_id = first_risk_id
+        self.id_allocator = id_allocator
+        self.id_block_size = id_block_size
+        # End of the block of Risk numbers leased through `id_allocator`.
+        self._id_block_end = None
+        self.version = 0
+        self._score_order = _ScoreOrder()
+        # Rows stay in Risk ID order as long as IDs are appended in increasing
+        # order, which is always the case for IDs allocated by the register.
+        self._last_risk_number = 0
+        self._in_id_order = True
+        self._views = {}
+        self._rollups = _Rollups(scale)
+        self.history = AssessmentHistory()
+        self.dependencies = RiskGraph(dependencies)
+        self._search_index = RiskSearchIndex()
+        self._unindexed = set()
+        self._unsaved = set()
+        self.dependencies_unsaved = bool(len(self.dependencies))
+        self.log_events = log_events
+        self._events = []
+        # Set while undoing or redoing, so their events are labelled as such.
+        self._event_action = None
+        # Store bookkeeping for shared registers: the stored version of each
+        # saved risk, the last logged event reflected here, and this writer.
+        self.row_versions = {}
+        self.synced_seq = 0
+        self.writer_id = uuid.uuid4().hex
+        self.history_limit = history_limit
+        self._undo = []
+        self._redo = []
+        self._change_seq = 0
+        # Snapshot id of the oldest state still reachable through undo.
+        self._history_base = 0
+
+    @classmethod
+    def from_frame(cls, rows, next_risk_id, **register_args):
+        """A register holding `rows` (with the REGISTER_COLUMNS) as already-saved risks.
+
+        The rows are not part of the undo or assessment history, and Risk IDs
+        continue from `next_risk_id`.
+        """
+        register = cls(first_risk_id=next_risk_id, **register_args)
+        if len(rows):
+            # Copy so the register owns writable buffers; rows read from Arrow may be read-only.
+            register._append_chunk(rows.reset_index(drop=True).copy())
+        register.mark_saved()
+        return register
+
+    def __len__(self):
+        return len(self._frame) + self._pending_count
+
+    def __contains__(self, risk_id):
+        return risk_id in self._positions
+
+    # --- Reading ---
+
+    @property
+    def df(self):
+        """The materialized register; flushes any buffered rows first."""
+        if self._pending_count:
+            self._fold_pending_rows()
+            chunks = self._pending_chunks
+            if not self._frame.empty:
+                chunks = [self._frame] + chunks
+            if len(chunks) == 1:
+                self._frame = chunks[0].reset_index(drop=True)
+            else:
+                self._frame = pd.concat(chunks, ignore_index=True)
+            self._pending_chunks = []
+            self._pending_count = 0
+        return self._frame
+
+    def position(self, risk_id):
+        """Row position of `risk_id` in `df`, or None if it is not registered."""
+        return self._positions.get(risk_id)
+
+    def get(self, risk_id):
+        """The register row for `risk_id` as a Series, or None."""
+        pos = self._positions.get(risk_id)
+        if pos is None:
+            return None
+        return self.df.iloc[pos]
+
+    def score_order(self):
+        """Row positions of `df` ordered by Risk Score, highest first."""
+        return self._score_order.order(self.df["Risk Score"].to_numpy())
+
+    def _view(self, name, build):
+        cached = self._views.get(name)
+        if cached is None or cached[0] != self.version:
+            cached = (self.version, build())
+            self._views[name] = cached
+        return cached[1]
+
+    def sorted_by_id(self):
+        """The register ordered by Risk ID, materialized once per version."""
+        if self._in_id_order:
+            return self.df
+        return self._view("id", lambda: self.df.take(np.argsort(
+            [risk_number(risk_id) for risk_id in self.df["Risk ID"]], kind="stable")))
+
+    def sorted_by_score(self):
+        """The register ordered by Risk Score, highest first, materialized once per version."""
+        return self._view("score", lambda: self.df.take(self.score_order()))
+
+    def report(self):
+        return self._view("report", lambda: build_report(self.df, self.score_order()))
+
+    def assessment_history(self):
+        """Every rating each risk has had, oldest first, with the risk's current Dimension.
+
+        Columns are Risk ID, Timestamp, Potential Impact, Likelihood, Risk
+        Score and Dimension (missing for risks no longer in the register).
+        """
+        history = self.history.to_frame(self.scale)
+        frame = self.df
+        history["Dimension"] = pd.Categorical(
+            history["Risk ID"].map(dict(zip(frame["Risk ID"], frame["Dimension"]))),
+            dtype=self._dtypes["Dimension"])
+        return history
+
+    # --- Dependencies ---
+
+    def add_dependency(self, parent, child, weight=1.0):
+        """Record that risk `parent` feeds risk `child`."""
+        for risk_id in (parent, child):
+            if risk_id not in self._positions:
+                raise RiskRegisterError(f"Risk ID {risk_id} not found.")
+        try:
+            self.dependencies.add_edge(parent, child, weight)
+        except RiskGraphError as e:
+            raise RiskRegisterError(str(e)) from e
+        self.dependencies_unsaved = True
+        self._emit("depend", "depend", {"parent": parent, "child": child, "weight": float(weight)})
+        self.version += 1
+
+    def remove_dependency(self, parent, child):
+        if not self.dependencies.remove_edge(parent, child):
+            raise RiskRegisterError(f"No dependency {parent} -> {child}.")
+        self.dependencies_unsaved = True
+        self._emit("undepend", "undepend", {"parent": parent, "child": child})
+        self.version += 1
+
+    def _own_score(self, risk_id):
+        pos = self._positions.get(risk_id)
+        if pos is None:
+            return None
+        return self.df["Risk Score"].iat[pos]
+
+    def effective_scores(self):
+        """Effective score per Risk ID, as a Series in `df` order.
+
+        A risk's effective score is the larger of its own Risk Score and each
+        of its parents' effective scores times the edge weight.
+        """
+        self.dependencies.propagate(self._own_score)
+        return self._view("effective", self._build_effective_scores)
+
+    def _build_effective_scores(self):
+        frame = self.df
+        scores = pd.Series(frame["Risk Score"].to_numpy(dtype=np.float64),
+                           index=pd.Index(frame["Risk ID"], name="Risk ID"),
+                           name="Effective Score")
+        effective = self.dependencies.effective_scores()
+        if effective:
+            effective = pd.Series(effective)
+            effective = effective[effective.index.isin(scores.index)]
+            scores[effective.index] = effective
+        return scores
+
+    def dependency_table(self):
+        """One row per edge: Upstream, Downstream, Weight and both effective scores."""
+        scores = self.effective_scores()
+        edges = pd.DataFrame(self.dependencies.edges(),
+                             columns=["Upstream", "Downstream", "Weight"])
+        for column in ("Upstream", "Downstream"):
+            edges[f"{column} Effective Score"] = edges[column].map(scores)
+        return edges
+
+    # --- Search ---
+
+    def search(self, query, limit=20):
+        """Risk IDs best matching `query`, best first (see `RiskSearchIndex.search`)."""
+        if self._unindexed:
+            self._reindex()
+        return [risk_id for risk_id, _ in self._search_index.search(query, limit)]
+
+    def _reindex(self):
+        frame = self.df
+        changed = sorted((risk_id for risk_id in self._unindexed if risk_id in self._positions),
+                         key=self._positions.get)
+        for risk_id in self._unindexed.difference(changed):
+            self._search_index.remove(risk_id)
+        rows = frame.iloc[[self._positions[risk_id] for risk_id in changed]]
+        columns = [rows[column].tolist() for column in SEARCH_FIELDS]
+        for risk_id, *texts in zip(changed, *columns):
+            self._search_index.add(risk_id, dict(zip(SEARCH_FIELDS, texts)))
+        self._unindexed.clear()
+
+    # --- Persistence ---
+
+    def unsaved_changes(self):
+        """Rows of the risks added or changed since `mark_saved`, and the Risk IDs removed."""
+        frame = self.df
+        present = sorted((risk_id for risk_id in self._unsaved if risk_id in self._positions),
+                         key=self._positions.get)
+        removed = sorted(self._unsaved.difference(present))
+        return frame.iloc[[self._positions[risk_id] for risk_id in present]], removed
+
+    def unsaved_events(self):
+        """Events emitted since `mark_saved`, oldest first."""
+        return list(self._events)
+
+    def has_unsaved_changes(self):
+        return bool(self._unsaved or self._events or self.dependencies_unsaved)
+
+    def mark_saved(self):
+        self._unsaved.clear()
+        self._events.clear()
+        self.dependencies_unsaved = False
+
+    def _emit(self, action, operation, data, timestamp=None):
+        if self.log_events:
+            self._events.append(RiskEvent(
+                time.time_ns() if timestamp is None else timestamp,
+                self._event_action or action, operation, data))
+
+    def apply_events(self, events):
+        """Replay logged events in order, without emitting or recording them for undo."""
+        log_events, self.log_events = self.log_events, False
+        try:
+            for event in events:
+                self._apply_event(event)
+        finally:
+            self.log_events = log_events
+
+    def _apply_event(self, event):
+        data = event.data
+        if event.operation == "insert":
+            rows = pd.DataFrame({column: data[column] for column in REGISTER_COLUMNS})
+            numbers = [risk_number(risk_id) for risk_id in rows["Risk ID"]]
+            if self.id_allocator is None:
+                self.next_risk_id = max(self.next_risk_id, max(numbers) + 1)
+            if event.action == "add":
+                self.history.append(numbers,
+                                    self.scale.impact_codes(rows["Potential Impact"]),
+                                    self.scale.likelihood_codes(rows["Likelihood"]),
+                                    rows["Risk Score"].to_numpy(), event.timestamp)
+            self._append_chunk(rows)
+        elif event.operation == "update":
+            positions = self._positions_for(data["Risk ID"])
+            values = {}
+            for column, column_data in data.items():
+                if column == "Risk ID":
+                    continue
+                if isinstance(column_data, list):
+                    column_data = np.asarray(column_data, dtype=self.scale.score_dtype
+                                             if column == "Risk Score" else object)
+                values[column] = column_data
+            self._write(positions, values, event.timestamp)
+        elif event.operation == "delete":
+            positions = np.sort(self._positions_for(data["Risk ID"]))
+            if positions[-1] == len(self) - 1 and positions[-1] - positions[0] == len(positions) - 1:
+                self._truncate(int(positions[0]))
+            else:
+                for pos in positions[::-1]:
+                    self._delete_row(int(pos))
+        elif event.operation == "reinsert":
+            self._insert_row(data["position"], pd.DataFrame(
+                {column: data[column] for column in REGISTER_COLUMNS}).astype(self._dtypes))
+        elif event.operation == "depend":
+            self.dependencies.add_edge(data["parent"], data["child"], data["weight"])
+            self.dependencies_unsaved = True
+            self.version += 1
+        elif event.operation == "undepend":
+            self.dependencies.remove_edge(data["parent"], data["child"])
+            self.dependencies_unsaved = True
+            self.version += 1
+        else:
+            raise RiskRegisterError(f"Unknown event operation '{event.operation}'.")
+
+    # --- Rollups ---
+
+    def dimension_counts(self):
+        """Number of risks per Dimension, read from the maintained rollups."""
+        return pd.Series(self._rollups.by_status.sum(axis=1), index=pd.Index(
+            RISK_DIMENSIONS, name="Dimension"), name="count")
+
+    def dimension_status_counts(self):
+        """Dimension x Status pivot of risk counts."""
+        return pd.DataFrame(self._rollups.by_status,
+                            index=pd.Index(RISK_DIMENSIONS, name="Dimension"),
+                            columns=pd.Index(RISK_STATUSES, name="Status"))
+
+    def dimension_band_counts(self):
+        """Dimension x score band pivot of risk counts (see `RiskScale.score_bands`)."""
+        return pd.DataFrame(self._rollups.by_band,
+                            index=pd.Index(RISK_DIMENSIONS, name="Dimension"),
+                            columns=pd.Index(self.scale.score_bands, name="Score Band"))
+
+    def check_rollups(self):
+        """Compare every rollup with a full recompute; raises AssertionError on a mismatch."""
+        expected = _Rollups(self.scale)
+        expected.count(self.df)
+        for name in ("by_status", "by_band"):
+            if not np.array_equal(getattr(self._rollups, name), getattr(expected, name)):
+                raise AssertionError(
+                    f"Rollup {name} is out of step with the register.")
+
+    def cache_key(self, frame):
+        """A key identifying `frame` if it is the current df or a current view.
+
+        Anything derived from such a frame can be cached under this key until
+        the next write. Returns None for any other DataFrame.
+        """
+        if frame is self.df:
+            return ("df", self.version)
+        for name, (version, view) in self._views.items():
+            if view is frame and version == self.version:
+                return (name, version)
+        return None
+
+    # --- Scoring ---
+
+    def score(self, potential_impact, likelihood):
+        """Risk = Impact x Likelihood on the register's scale."""
+        if not self.scale.is_valid(potential_impact, likelihood):
+            raise RiskRegisterError(
+                f"Invalid rating: Potential Impact '{potential_impact}', Likelihood '{likelihood}'.")
+        return self.scale.score(potential_impact, likelihood)
+
+    # --- Writing ---
+
+    def _allocate_ids(self, count):
+        if self.id_allocator is not None and (
+                self._id_block_end is None or self.next_risk_id + count > self._id_block_end):
+            size = max(count, self.id_block_size)
+            self.next_risk_id = self.id_allocator(size)
+            self._id_block_end = self.next_risk_id + size
+        first_id = self.next_risk_id
+        self.next_risk_id += count
+        return [format_risk_id(n) for n in range(first_id, first_id + count)]
+
+    def add_risk(self, dimension, category, description, potential_impact=None, likelihood=None):
+        """Add one risk and return its Risk ID.
+
+        Unrated risks get the middle level of the scale on each axis, or their
+        rule-based classification when `classify_on_insert` is set. Raises
+        RiskRegisterError for the rows `add_risks` rejects: an unknown
+        Dimension, a blank Description or an invalid rating.
+        """
+        if self.classify_on_insert and self.rules is not None and not (potential_impact or likelihood):
+            return self.add_risks([{"dimension": dimension, "category": category,
+                                    "description": description}])[0]
+        potential_impact = potential_impact or self.scale.default_impact
+        likelihood = likelihood or self.scale.default_likelihood
+        if dimension not in RISK_DIMENSIONS:
+            raise RiskRegisterError(f"Invalid Dimension '{dimension}'.")
+        if not str(description or "").strip():
+            raise RiskRegisterError("A risk needs a Description.")
+        risk_score = self.score(potential_impact, likelihood)
+
+        risk_id = self._allocate_ids(1)[0]
+        self._record(_Change("insert", [risk_id], start=len(self)))
+        self._note_inserted([risk_id], len(self))
+        self._rollups.count_one(dimension, "Identified", risk_score)
+        timestamp = time.time_ns()
+        self.history.append([risk_number(risk_id)],
+                            [self.scale.impact_levels.index(potential_impact)],
+                            [self.scale.likelihood_levels.index(likelihood)],
+                            [risk_score], timestamp)
+        row = {
+            "Risk ID": risk_id,
+            "Dimension": dimension,
+            "Category": category,
+            "Description": description,
+            "Potential Impact": potential_impact,
+            "Likelihood": likelihood,
+            "Risk Score": risk_score,
+            "Mitigation Strategy": DEFAULT_MITIGATION,
+            "Responsible Party": DEFAULT_RESPONSIBLE_PARTY,
+            "Status": "Identified"
+        }
+        self._pending_rows.append(row)
+        self._pending_count += 1
+        self._emit("add", "insert", {column: [column_values(value)] for column, value in row.items()},
+                   timestamp)
+        return risk_id
+
+    def add_risks(self, risks):
+        """Add many risks in a single write and return their Risk IDs.
+
+        Each item in `risks` is a dict with the same keys as the arguments of
+        `add_risk` ("potential_impact" and "likelihood" default to the middle
+        level of the scale), optionally with "mitigation_strategy" and
+        "responsible_party". Risks that get a mitigation strategy, given or
+        suggested by the rules, are marked Mitigation Proposed; other risks
+        rated by the rules are marked Assessed. `risks` may also be a
+        DataFrame with those columns. The rows get a contiguous block of Risk IDs and are
+        validated and scored in one vectorized pass.
+        """
+        columns = ["dimension", "category", "description", "potential_impact", "likelihood",
+                   "mitigation_strategy", "responsible_party"]
+        if isinstance(risks, pd.DataFrame):
+            new_risks = risks.reindex(columns=columns).reset_index(drop=True)
+        else:
+            new_risks = pd.DataFrame.from_records(list(risks), columns=columns)
+        if new_risks.empty:
+            return []
+        mitigations = pd.Series(DEFAULT_MITIGATION, index=new_risks.index)
+        responsible_parties = pd.Series(
+            DEFAULT_RESPONSIBLE_PARTY, index=new_risks.index)
+        assessed = np.zeros(len(new_risks), dtype=bool)
+        if self.classify_on_insert and self.rules is not None:
+            suggested = self.rules.classify(new_risks.rename(columns={
+                "dimension": "Dimension", "category": "Category", "description": "Description"}))
+            unrated = (new_risks["potential_impact"].isna() &
+                       new_risks["likelihood"].isna() &
+                       suggested["potential_impact"].notna())
+            for column in ("potential_impact", "likelihood"):
+                new_risks[column] = new_risks[column].astype(
+                    object).mask(unrated, suggested[column])
+            # Rated by the rules means assessed, as `assess` marks it.
+            assessed = unrated.to_numpy()
+            has_mitigation = suggested["mitigation"].notna()
+            mitigations[has_mitigation] = suggested["mitigation"]
+            responsible_parties[has_mitigation] = suggested["responsible_party"]
+        given = new_risks["mitigation_strategy"].fillna("").ne("")
+        mitigations = mitigations.mask(given, new_risks["mitigation_strategy"])
+        # A mitigation from the rules or the input moves the risk on, as `mitigate` does.
+        mitigated = mitigations.ne(DEFAULT_MITIGATION).to_numpy()
+        has_owner = new_risks["responsible_party"].fillna("").ne("")
+        responsible_parties = responsible_parties.mask(has_owner, new_risks["responsible_party"])
+        new_risks["potential_impact"] = new_risks["potential_impact"].fillna(
+            self.scale.default_impact)
+        new_risks["likelihood"] = new_risks["likelihood"].fillna(
+            self.scale.default_likelihood)
+
+        risk_scores, valid = self.scale.score_many(
+            new_risks["potential_impact"], new_risks["likelihood"])
+        invalid = (~valid |
+                   ~new_risks["dimension"].isin(RISK_DIMENSIONS) |
+                   new_risks["description"].fillna("").astype(str).str.strip().eq(""))
+        if invalid.any():
+            raise RiskRegisterError(
+                f"{int(invalid.sum())} risk(s) could not be added "
+                f"(rows {_describe(invalid[invalid].index + 1)}). "
+                "Check the Dimension, Description, Potential Impact and Likelihood values.")
+
+        risk_ids = self._allocate_ids(len(new_risks))
+        first_number = risk_number(risk_ids[0])
+        self._record(_Change("insert", risk_ids, start=len(self)))
+        timestamp = time.time_ns()
+        self.history.append(np.arange(first_number, first_number + len(risk_ids)),
+                            self.scale.impact_codes(new_risks["potential_impact"]),
+                            self.scale.likelihood_codes(new_risks["likelihood"]),
+                            risk_scores, timestamp)
+        self._append_chunk(pd.DataFrame({
+            "Risk ID": risk_ids,
+            "Dimension": new_risks["dimension"],
+            "Category": new_risks["category"].fillna(""),
+            "Description": new_risks["description"],
+            "Potential Impact": new_risks["potential_impact"],
+            "Likelihood": new_risks["likelihood"],
+            "Risk Score": risk_scores,
+            "Mitigation Strategy": mitigations,
+            "Responsible Party": responsible_parties,
+            "Status": np.select([mitigated, assessed], ["Mitigation Proposed", "Assessed"],
+                                "Identified")
+        }), timestamp)
+        return risk_ids
+
+    def assess(self, risk_id, potential_impact, likelihood):
+        """Rate one risk, mark it Assessed and return its new score."""
+        risk_score = self.score(potential_impact, likelihood)
+        self._update(risk_id, {
+            "Potential Impact": potential_impact,
+            "Likelihood": likelihood,
+            "Risk Score": risk_score,
+            "Status": "Assessed"
+        })
+        return risk_score
+
+    def assess_many(self, assessments):
+        """Apply (risk_id, potential_impact, likelihood) tuples as one update.
+
+        `assessments` may also be a DataFrame with those three columns. Every
+        Risk ID and rating is validated before anything is written; a Risk
+        ID listed more than once gets its last assessment. Returns the number
+        of risks updated.
+        """
+        batch = _as_batch(
+            assessments, ["risk_id", "potential_impact", "likelihood"])
+        if batch.empty:
+            return 0
+
+        risk_scores, valid = self.scale.score_many(
+            batch["potential_impact"], batch["likelihood"])
+        invalid = ~valid
+        if invalid.any():
+            raise RiskRegisterError(
+                f"{int(invalid.sum())} assessment(s) have invalid ratings "
+                f"({_describe(batch['risk_id'][invalid].unique())}). No changes were applied.")
+        last = _last_per_risk(batch)
+        batch, risk_scores = batch[last], risk_scores[last]
+        positions = self._positions_for(batch["risk_id"])
+
+        self._update_many(positions, {
+            "Potential Impact": batch["potential_impact"].to_numpy(),
+            "Likelihood": batch["likelihood"].to_numpy(),
+            "Risk Score": risk_scores,
+            "Status": "Assessed"
+        })
+        return len(batch)
+
+    def mitigate(self, risk_id, strategy_description, responsible_party):
+        """Record a mitigation strategy for one risk."""
+        self._update(risk_id, {
+            "Mitigation Strategy": strategy_description,
+            "Responsible Party": responsible_party,
+            "Status": "Mitigation Proposed"
+        })
+
+    def mitigate_many(self, mitigations):
+        """Apply (risk_id, strategy_description, responsible_party) tuples as one update.
+
+        `mitigations` may also be a DataFrame with those three columns. A
+        Risk ID listed more than once gets its last mitigation. Returns the
+        number of risks updated.
+        """
+        batch = _as_batch(
+            mitigations, ["risk_id", "strategy_description", "responsible_party"])
+        if batch.empty:
+            return 0
+        batch = batch[_last_per_risk(batch)]
+        positions = self._positions_for(batch["risk_id"])
+
+        self._update_many(positions, {
+            "Mitigation Strategy": batch["strategy_description"].to_numpy(),
+            "Responsible Party": batch["responsible_party"].to_numpy(),
+            "Status": "Mitigation Proposed"
+        })
+        return len(batch)
+
+    def auto_assess(self, rules=None):
+        """Assess every risk matched by the rules in one update; returns the count."""
+        if rules is None:
+            rules = self.rules
+        if rules is None or not len(self):
+            return 0
+        return self.assess_many(rules.assessments(self.df))
+
+    def auto_mitigate(self, rules=None):
+        """Propose mitigations for every risk matched by the rules; returns the count."""
+        if rules is None:
+            rules = self.rules
+        if rules is None or not len(self):
+            return 0
+        return self.mitigate_many(rules.mitigations(self.df))
+
+    def remove(self, risk_id):
+        """Delete one risk."""
+        pos = self._positions.get(risk_id)
+        if pos is None:
+            raise RiskRegisterError(f"Risk ID {risk_id} not found.")
+        self._record(_Change("remove", [risk_id], start=pos,
+                             rows=self.df.iloc[[pos]].copy()))
+        self._delete_row(pos)
+
+    # --- Versions ---
+
+    def snapshot(self):
+        """An id for the current state, usable with `restore` and `changes_since`."""
+        return self._undo[-1].seq if self._undo else self._history_base
+
+    def can_undo(self):
+        return bool(self._undo)
+
+    def can_redo(self):
+        return bool(self._redo)
+
+    def undo(self):
+        """Revert the most recent write; returns False if there is nothing to undo."""
+        if not self._undo:
+            return False
+        change = self._undo.pop()
+        self._event_action = "undo"
+        try:
+            if change.kind == "insert":
+                change.rows = self.df.iloc[change.start:].copy()
+                self._truncate(change.start)
+            elif change.kind == "update":
+                self._write(change.positions, change.before)
+            else:
+                self._insert_row(change.start, change.rows)
+        finally:
+            self._event_action = None
+        self._redo.append(change)
+        return True
+
+    def redo(self):
+        """Re-apply the most recently undone write; returns False if there is none."""
+        if not self._redo:
+            return False
+        change = self._redo.pop()
+        self._event_action = "redo"
+        try:
+            if change.kind == "insert":
+                self._append_chunk(change.rows)
+            elif change.kind == "update":
+                self._write(change.positions, change.after)
+            else:
+                self._delete_row(change.start)
+        finally:
+            self._event_action = None
+        self._undo.append(change)
+        return True
+
+    def discard_undo_history(self):
+        """Forget every undo and redo record, e.g. after applying other writers' events."""
+        self._undo.clear()
+        self._redo.clear()
+        self._history_base = self._change_seq
+
+    def _undo_to(self, snapshot):
+        seqs = [change.seq for change in self._undo]
+        if snapshot != self._history_base and snapshot not in seqs:
+            raise RiskRegisterError(
+                f"Snapshot {snapshot} is no longer in the register history.")
+        return self._undo[bisect.bisect_right(seqs, snapshot):]
+
+    def restore(self, snapshot):
+        """Undo every write made after `snapshot`; they can be redone afterwards."""
+        for _ in self._undo_to(snapshot):
+            self.undo()
+
+    def changes_since(self, snapshot):
+        """What changed after `snapshot`, one row per added/removed risk or updated field.
+
+        Columns are Risk ID, Change, Field, Before and After.
+        """
+        records = []
+        for change in self._undo_to(snapshot):
+            if change.kind == "update":
+                for column in change.after:
+                    before = change.before[column]
+                    after = np.broadcast_to(
+                        change.after[column], before.shape)
+                    for risk_id, old, new in zip(change.risk_ids, before, after):
+                        if old != new:
+                            records.append(
+                                (risk_id, "Updated", column, old, new))
+            else:
+                label = "Added" if change.kind == "insert" else "Removed"
+                records.extend((risk_id, label, None, None, None)
+                               for risk_id in change.risk_ids)
+        return pd.DataFrame.from_records(
+            records, columns=["Risk ID", "Change", "Field", "Before", "After"])
+
+    # --- Storage internals ---
+
+    def _record(self, change):
+        """Push a change onto the undo history; a new write clears redo."""
+        self._change_seq += 1
+        change.seq = self._change_seq
+        self._undo.append(change)
+        self._redo.clear()
+        if len(self._undo) > self.history_limit:
+            self._history_base = self._undo.pop(0).seq
+
+    def _truncate(self, start):
+        """Drop every row from `start` on (undoing the latest insert)."""
+        frame = self.df
+        for risk_id in frame["Risk ID"].iloc[start:]:
+            del self._positions[risk_id]
+        self._rollups.count(frame.iloc[start:], -1)
+        self.dependencies.mark(frame["Risk ID"].iloc[start:])
+        self._unindexed.update(frame["Risk ID"].iloc[start:])
+        self._unsaved.update(frame["Risk ID"].iloc[start:])
+        self._emit("remove", "delete", {"Risk ID": frame["Risk ID"].iloc[start:].tolist()})
+        self._frame = frame.iloc[:start]
+        self._score_order.truncate(start)
+        self.version += 1
+
+    def _delete_row(self, pos):
+        risk_id = self.df["Risk ID"].iat[pos]
+        del self._positions[risk_id]
+        self._rollups.count(self.df.iloc[[pos]], -1)
+        self.dependencies.mark([risk_id])
+        self._unindexed.add(risk_id)
+        self._unsaved.add(risk_id)
+        self._emit("remove", "delete", {"Risk ID": [risk_id]})
+        self._frame = self.df.drop(index=pos).reset_index(drop=True)
+        for moved_id in self._frame["Risk ID"].iloc[pos:]:
+            self._positions[moved_id] -= 1
+        self._score_order.reset()
+        self.version += 1
+
+    def _insert_row(self, pos, row_df):
+        frame = self.df
+        # A row replayed from another writer's undo goes back where that
+        # writer had it, which need not be in Risk ID order here.
+        number = risk_number(row_df["Risk ID"].iat[0])
+        if self._in_id_order and (
+                (pos > 0 and risk_number(frame["Risk ID"].iat[pos - 1]) >= number) or
+                (pos < len(frame) and risk_number(frame["Risk ID"].iat[pos]) <= number)):
+            self._in_id_order = False
+        self._last_risk_number = max(self._last_risk_number, number)
+        self._frame = pd.concat(
+            [frame.iloc[:pos], row_df, frame.iloc[pos:]], ignore_index=True)
+        for moved_id in self._frame["Risk ID"].iloc[pos + 1:]:
+            self._positions[moved_id] += 1
+        self._positions[row_df["Risk ID"].iat[0]] = pos
+        self.dependencies.mark([row_df["Risk ID"].iat[0]])
+        self._unindexed.add(row_df["Risk ID"].iat[0])
+        self._unsaved.add(row_df["Risk ID"].iat[0])
+        self._emit("add", "reinsert", {"position": pos, **{
+            column: column_values(row_df[column]) for column in REGISTER_COLUMNS}})
+        self._rollups.count(row_df)
+        self._score_order.reset()
+        self.version += 1
+
+    def _note_inserted(self, risk_ids, start):
+        """Index new rows at positions start.. and queue them for the score order."""
+        self._positions.update(
+            zip(risk_ids, range(start, start + len(risk_ids))))
+        self._score_order.mark(range(start, start + len(risk_ids)))
+        self.dependencies.mark(risk_ids)
+        self._unindexed.update(risk_ids)
+        self._unsaved.update(risk_ids)
+        numbers = [risk_number(risk_id) for risk_id in risk_ids]
+        if self._in_id_order and (numbers[0] <= self._last_risk_number or
+                                  any(a >= b for a, b in zip(numbers, numbers[1:]))):
+            self._in_id_order = False
+        self._last_risk_number = max(self._last_risk_number, *numbers)
+        self.version += 1
+
+    def _append_chunk(self, rows_df, timestamp=None):
+        self._note_inserted(list(rows_df["Risk ID"]), len(self))
+        self._fold_pending_rows()
+        chunk = rows_df[REGISTER_COLUMNS].astype(self._dtypes)
+        self._rollups.count(chunk)
+        self._emit("add", "insert", {column: column_values(chunk[column])
+                                     for column in REGISTER_COLUMNS}, timestamp)
+        self._pending_chunks.append(chunk)
+        self._pending_count += len(rows_df)
+
+    def _fold_pending_rows(self):
+        if self._pending_rows:
+            self._pending_chunks.append(
+                pd.DataFrame(self._pending_rows, columns=REGISTER_COLUMNS)
+                .astype(self._dtypes))
+            self._pending_rows = []
+
+    def _positions_for(self, risk_ids):
+        """Row positions for a batch of Risk IDs; raises if any are unknown."""
+        positions = pd.Series(risk_ids, dtype=object).map(self._positions)
+        missing = positions.isna()
+        if missing.any():
+            raise RiskRegisterError(
+                f"{int(missing.sum())} update(s) refer to unknown Risk IDs "
+                f"({_describe(pd.Series(risk_ids)[missing.to_numpy()].unique())}). No changes were applied.")
+        return positions.astype(int).to_numpy()
+
+    def _update(self, risk_id, values):
+        pos = self._positions.get(risk_id)
+        if pos is None:
+            raise RiskRegisterError(f"Risk ID {risk_id} not found.")
+        self._update_many(np.array([pos]), values)
+
+    def _update_many(self, positions, values):
+        # Values must already fit the register's column dtypes.
+        frame = self.df
+        # Copy: a read covering every row in order may be a view of the
+        # column, which `_write` then overwrites in place.
+        before = {column: frame.iloc[positions, self._column_positions[column]].to_numpy(copy=True)
+                  for column in values}
+        self._record(_Change("update", frame["Risk ID"].to_numpy()[positions],
+                             positions=positions, before=before, after=values))
+        self._write(positions, values)
+
+    def _write(self, positions, values, timestamp=None):
+        frame = self.df
+        if timestamp is None:
+            timestamp = time.time_ns()
+        rolled_up = not _ROLLUP_COLUMNS.isdisjoint(values)
+        if rolled_up:
+            # A batch may name a risk more than once; count each row once.
+            touched = np.unique(positions)
+            self._rollups.count(frame.iloc[touched], -1)
+        for column, new_values in values.items():
+            frame.iloc[positions, self._column_positions[column]] = new_values
+        if rolled_up:
+            self._rollups.count(frame.iloc[touched])
+        risk_ids = frame["Risk ID"].iloc[positions]
+        self._unsaved.update(risk_ids)
+        if not SEARCH_FIELDS.keys().isdisjoint(values):
+            self._unindexed.update(risk_ids)
+        if "Risk Score" in values:
+            self._score_order.mark(positions.tolist())
+            self.dependencies.mark(frame["Risk ID"].iloc[positions])
+            self.history.append(
+                frame["Risk ID"].iloc[positions].str[1:].astype(int).to_numpy(),
+                frame["Potential Impact"].array.codes[positions],
+                frame["Likelihood"].array.codes[positions],
+                frame["Risk Score"].to_numpy()[positions], timestamp)
+        action = ("assess" if "Risk Score" in values else
+                  "mitigate" if "Mitigation Strategy" in values else "update")
+        self._emit(action, "update", {"Risk ID": risk_ids.tolist(), **{
+            column: column_values(new_values) for column, new_values in values.items()}},
+            timestamp)
+        self.version += 1
@@ -0,0 +1,191 @@
+"""Declarative rules for auto-assessing and auto-mitigating risks.
+
+A `RiskRule` matches risks on Dimension, Category and Description keywords and
+assigns an impact/likelihood rating, a mitigation strategy and an owner. A
+`RuleSet` evaluates its rules over a whole register at once: each rule becomes
+a vectorized column mask, rules are tried in order, and the first matching
+rule that sets a given action wins for that action.
+"""
+import re
+
+import numpy as np
+import pandas as pd
+
+
+class RiskRule:
+    """One classification rule.
+
+    Match fields left as None (or empty `keywords`) match every risk. Keywords
+    are matched case-insensitively anywhere in the Description, and any one
+    keyword is enough. Action fields left as None are not assigned by the rule.
+    """
+
+    def __init__(self, name, dimension=None, category=None, keywords=(),
+                 potential_impact=None, likelihood=None,
+                 mitigation=None, responsible_party=None):
+        self.name = name
+        self.dimension = dimension
+        self.category = category
+        self.keywords = tuple(keywords)
+        self.potential_impact = potential_impact
+        self.likelihood = likelihood
+        self.mitigation = mitigation
+        self.responsible_party = responsible_party
+        self._pattern = None
+        if self.keywords:
+            self._pattern = re.compile(
+                "|".join(map(re.escape, self.keywords)), re.IGNORECASE)
+
+    def __repr__(self):
+        return f"RiskRule({self.name!r})"
+
+    @property
+    def assesses(self):
+        return self.potential_impact is not None and self.likelihood is not None
+
+    @property
+    def mitigates(self):
+        return self.mitigation is not None
+
+    def mask(self, risk_df, candidates):
+        """Narrow the boolean array `candidates` to rows this rule matches."""
+        mask = candidates.copy()
+        if self.dimension is not None:
+            mask &= (risk_df["Dimension"] == self.dimension).to_numpy()
+        if self.category is not None:
+            mask &= (risk_df["Category"] == self.category).to_numpy()
+        if self._pattern is not None and mask.any():
+            # Only run the regex over rows that are still candidates.
+            descriptions = risk_df["Description"].iloc[np.flatnonzero(mask)]
+            mask[mask] = descriptions.str.contains(
+                self._pattern, na=False).to_numpy()
+        return mask
+
+
+class RuleSet:
+    """An ordered list of rules evaluated together over a register."""
+
+    def __init__(self, rules):
+        self.rules = list(rules)
+        self._assessment_rules = [r for r in self.rules if r.assesses]
+        self._mitigation_rules = [r for r in self.rules if r.mitigates]
+
+    def __len__(self):
+        return len(self.rules)
+
+    @staticmethod
+    def _first_match(risk_df, rules):
+        """Index into `rules` of the first rule matching each row, or -1."""
+        matched = np.full(len(risk_df), -1)
+        unmatched = np.ones(len(risk_df), dtype=bool)
+        for i, rule in enumerate(rules):
+            if not unmatched.any():
+                break
+            mask = rule.mask(risk_df, unmatched)
+            matched[mask] = i
+            unmatched &= ~mask
+        return matched
+
+    @staticmethod
+    def _gather(rules, attribute, matched):
+        values = np.array([getattr(rule, attribute)
+                          for rule in rules] + [None], dtype=object)
+        # -1 (no rule) picks the trailing None.
+        return values[matched]
+
+    def classify(self, risk_df):
+        """Suggested actions for every row of `risk_df`.
+
+        Returns a DataFrame aligned with `risk_df` with columns
+        potential_impact, likelihood, mitigation and responsible_party; a row
+        holds None where no rule applies. `risk_df` needs the Dimension,
+        Category and Description columns.
+        """
+        assessed = self._first_match(risk_df, self._assessment_rules)
+        mitigated = self._first_match(risk_df, self._mitigation_rules)
+        return pd.DataFrame({
+            "potential_impact": self._gather(self._assessment_rules, "potential_impact", assessed),
+            "likelihood": self._gather(self._assessment_rules, "likelihood", assessed),
+            "mitigation": self._gather(self._mitigation_rules, "mitigation", mitigated),
+            "responsible_party": self._gather(self._mitigation_rules, "responsible_party", mitigated),
+        }, index=risk_df.index)
+
+    def assessments(self, risk_df):
+        """(risk_id, potential_impact, likelihood) rows for every matched risk."""
+        matched = self._first_match(risk_df, self._assessment_rules)
+        hit = matched >= 0
+        return pd.DataFrame({
+            "risk_id": risk_df["Risk ID"].to_numpy()[hit],
+            "potential_impact": self._gather(self._assessment_rules, "potential_impact", matched[hit]),
+            "likelihood": self._gather(self._assessment_rules, "likelihood", matched[hit]),
+        })
+
+    def mitigations(self, risk_df):
+        """(risk_id, strategy_description, responsible_party) rows for every matched risk."""
+        matched = self._first_match(risk_df, self._mitigation_rules)
+        hit = matched >= 0
+        return pd.DataFrame({
+            "risk_id": risk_df["Risk ID"].to_numpy()[hit],
+            "strategy_description": self._gather(self._mitigation_rules, "mitigation", matched[hit]),
+            "responsible_party": self._gather(self._mitigation_rules, "responsible_party", matched[hit]),
+        })
+
+
+# Rules for the Credit Risk Scoring Model. The category rules carry the expert
+# assessments and mitigations for the risks identified on page 5; the keyword
+# rules after them give a first rating to risks added by hand or imported.
+CREDIT_MODEL_RULES = RuleSet([
+    RiskRule("Historical data bias", category="Data Bias",
+             potential_impact="High", likelihood="Medium",
+             mitigation="Conduct regular fairness audits across protected groups. Explore data augmentation or re-sampling techniques to debias training data. Implement post-processing bias mitigation techniques.",
+             responsible_party="Data Science & AI Ethics Committee"),
+    RiskRule("CreditScore lag", category="Data Provenance & Relevance",
+             potential_impact="Medium", likelihood="High"),
+    RiskRule("Data privacy", category="Data Privacy",
+             potential_impact="Medium", likelihood="Medium"),
+    RiskRule("Algorithmic bias", category="Algorithmic Bias & Fairness",
+             potential_impact="High", likelihood="Medium",
+             mitigation="Implement disparate impact testing during model validation. Use fairness-aware training algorithms or re-weighing techniques. Document fairness metrics in model card.",
+             responsible_party="Model Validation & Data Science"),
+    RiskRule("Accuracy & reliability", category="Accuracy & Reliability",
+             potential_impact="Medium", likelihood="Low"),
+    RiskRule("Concept drift", category="Model Robustness",
+             potential_impact="High", likelihood="High",
+             mitigation="Implement continuous monitoring for concept drift (e.g., population stability index) with quarterly model re-calibration or re-training. Develop a champion-challenger framework.",
+             responsible_party="Model Monitoring Team"),
+    RiskRule("Interpretability", category="Interpretability",
+             potential_impact="Medium", likelihood="High"),
+    RiskRule("Integration flaws", category="Integration Flaws",
+             potential_impact="Medium", likelihood="Medium"),
+    RiskRule("AI supply chain", category="AI Supply Chain Vulnerabilities",
+             potential_impact="High", likelihood="Low"),
+    RiskRule("Scalability", category="Scalability & Performance",
+             potential_impact="Medium", likelihood="Medium"),
+    RiskRule("Misuse & misinterpretation", category="Misuse & Misinterpretation",
+             potential_impact="Medium", likelihood="High"),
+    RiskRule("Over-reliance", category="Over-Reliance & Autonomy Creep",
+             potential_impact="High", likelihood="Medium"),
+    RiskRule("Loss of human oversight", category="Loss of Human Oversight",
+             potential_impact="High", likelihood="High",
+             mitigation="Establish clear 'human-in-the-loop' checkpoints for all high-value loan decisions and edge cases. Mandate model explanation training for loan officers.",
+             responsible_party="Operations & Compliance"),
+    RiskRule("No AI ethics committee", category="Robust Governance & Oversight",
+             potential_impact="High", likelihood="Medium",
+             mitigation="Propose the formation of a cross-functional AI Ethics Committee to guide policy, review high-risk models, and provide an 'effective challenge' on ethical considerations.",
+             responsible_party="Senior Management & Governance"),
+    RiskRule("No incident response plan", category="Policy & Ethical Guidelines",
+             potential_impact="High", likelihood="High",
+             mitigation="Develop and socialize a comprehensive AI model incident response plan, including clear communication protocols, rollback procedures, and stakeholder notification processes.",
+             responsible_party="Risk Management & IT Operations"),
+    RiskRule("Insufficient training", category="Responsible AI Culture",
+             potential_impact="Medium", likelihood="Medium"),
+
+    RiskRule("Bias or fairness keywords", keywords=("bias", "fairness", "disparate", "discriminat"),
+             potential_impact="High", likelihood="Medium"),
+    RiskRule("Drift keywords", keywords=("drift", "degrade", "instability"),
+             potential_impact="High", likelihood="Medium"),
+    RiskRule("Security or privacy keywords", keywords=("security", "vulnerab", "privacy", "breach"),
+             potential_impact="High", likelihood="Low"),
+    RiskRule("Oversight keywords", dimension="Human", keywords=("oversight", "override", "over-reliance"),
+             potential_impact="Medium", likelihood="High"),
+])
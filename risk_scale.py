@@ -0,0 +1,119 @@
+"""Impact x likelihood rating scales.
+
+A `RiskScale` names the rating levels on each axis and how they are weighted.
+It is compiled once into integer lookup arrays, so scoring a whole column of
+ratings is a single vectorized gather: ratings become category codes and the
+codes index straight into the score table.
+"""
+import numpy as np
+import pandas as pd
+
+
+class RiskScale:
+    """An N x M rating scale with weighted scoring.
+
+    Score = impact weight x likelihood weight, with weights defaulting to
+    1..N and 1..M. `score_table` may be passed instead to set every cell
+    explicitly (shape N x M, impact rows, likelihood columns).
+    """
+
+    def __init__(self, name, impact_levels, likelihood_levels,
+                 impact_weights=None, likelihood_weights=None, score_table=None):
+        self.name = name
+        self.impact_levels = list(impact_levels)
+        self.likelihood_levels = list(likelihood_levels)
+
+        if score_table is None:
+            if impact_weights is None:
+                impact_weights = range(1, len(self.impact_levels) + 1)
+            if likelihood_weights is None:
+                likelihood_weights = range(1, len(self.likelihood_levels) + 1)
+            score_table = np.outer(list(impact_weights),
+                                   list(likelihood_weights))
+        score_table = np.asarray(score_table)
+        if score_table.shape != (len(self.impact_levels), len(self.likelihood_levels)):
+            raise ValueError(
+                f"Score table for scale '{name}' must be {len(self.impact_levels)} x {len(self.likelihood_levels)}.")
+
+        self.max_score = int(score_table.max())
+        self.score_dtype = np.dtype(
+            "int8") if self.max_score <= np.iinfo("int8").max else np.dtype("int16")
+        # One extra zero row and column: an unknown rating has category code -1,
+        # which indexes the last row/column and so scores 0.
+        self._score_lookup = np.zeros(
+            (len(self.impact_levels) + 1, len(self.likelihood_levels) + 1),
+            dtype=self.score_dtype)
+        self._score_lookup[:-1, :-1] = score_table
+
+        # Score bands split 1..max_score into thirds; unrated (0) counts as Low.
+        self.score_bands = ["Low", "Medium", "High"]
+        scores = np.arange(self.max_score + 1)
+        self._band_lookup = np.clip(
+            (3 * scores + self.max_score - 1) // self.max_score - 1, 0, 2).astype(np.int8)
+
+        self.impact_dtype = pd.CategoricalDtype(
+            self.impact_levels, ordered=True)
+        self.likelihood_dtype = pd.CategoricalDtype(
+            self.likelihood_levels, ordered=True)
+        self._impact_codes = {level: i for i,
+                              level in enumerate(self.impact_levels)}
+        self._likelihood_codes = {level: i for i,
+                                  level in enumerate(self.likelihood_levels)}
+
+    def __repr__(self):
+        return f"RiskScale({self.name!r}, {len(self.impact_levels)}x{len(self.likelihood_levels)})"
+
+    @property
+    def default_impact(self):
+        """The middle impact level, used when a new risk is not rated."""
+        return self.impact_levels[(len(self.impact_levels) - 1) // 2]
+
+    @property
+    def default_likelihood(self):
+        return self.likelihood_levels[(len(self.likelihood_levels) - 1) // 2]
+
+    def is_valid(self, potential_impact, likelihood):
+        return potential_impact in self._impact_codes and likelihood in self._likelihood_codes
+
+    def score(self, potential_impact, likelihood):
+        """Score for one pair of ratings; 0 if either rating is unknown."""
+        return int(self._score_lookup[self._impact_codes.get(potential_impact, -1),
+                                      self._likelihood_codes.get(likelihood, -1)])
+
+    def impact_codes(self, potential_impacts):
+        """Integer codes (0..N-1, -1 if unknown) for a column of impact ratings."""
+        return pd.Categorical(potential_impacts, dtype=self.impact_dtype).codes
+
+    def likelihood_codes(self, likelihoods):
+        return pd.Categorical(likelihoods, dtype=self.likelihood_dtype).codes
+
+    def score_codes(self, impact_codes, likelihood_codes):
+        """Scores for arrays of rating codes in one gather; -1 codes score 0."""
+        return self._score_lookup[impact_codes, likelihood_codes]
+
+    def band_codes(self, scores):
+        """Index into `score_bands` for an array of scores."""
+        return self._band_lookup[scores]
+
+    def score_many(self, potential_impacts, likelihoods):
+        """Scores for columns of ratings, plus a mask of rows with valid ratings."""
+        impact_codes = self.impact_codes(potential_impacts)
+        likelihood_codes = self.likelihood_codes(likelihoods)
+        valid = (impact_codes >= 0) & (likelihood_codes >= 0)
+        return self.score_codes(impact_codes, likelihood_codes), valid
+
+
+DEFAULT_SCALE = RiskScale(
+    "3x3", ["Low", "Medium", "High"], ["Low", "Medium", "High"])
+
+# Five-level policy scale. The level names extend the 3x3 scale, so ratings
+# written for one scale stay valid on the other. Impact is weighted more
+# steeply than likelihood so severe-but-rare risks outrank frequent nuisances.
+WEIGHTED_5X5_SCALE = RiskScale(
+    "5x5",
+    ["Very Low", "Low", "Medium", "High", "Very High"],
+    ["Very Low", "Low", "Medium", "High", "Very High"],
+    impact_weights=[1, 2, 3, 5, 8],
+    likelihood_weights=[1, 2, 3, 4, 5])
+
+SCALES = {scale.name: scale for scale in (DEFAULT_SCALE, WEIGHTED_5X5_SCALE)}
@@ -0,0 +1,127 @@
+"""Ranked keyword search over the register's free-text columns.
+
+`RiskSearchIndex` is an inverted index from tokens to the risks containing
+them, built over Category, Description and Mitigation Strategy. Risks are
+re-indexed individually when they change, so keeping the index current costs
+time proportional to the changed rows. A query looks up only the postings of
+its own tokens, so it stays well under a millisecond on registers of
+thousands of risks.
+
+Matches are ranked by TF-IDF: each query token contributes its field-weighted
+count in the risk times log(1 + N / number of risks containing it). The last
+query token also matches as a prefix, which suits search-as-you-type.
+"""
+import bisect
+import heapq
+import math
+import operator
+import re
+from collections import Counter
+
+
+# Weight of a token occurrence in each indexed column.
+SEARCH_FIELDS = {"Category": 2.0, "Description": 1.0, "Mitigation Strategy": 1.0}
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+# "e" and "g" are what "e.g." tokenizes to.
+_STOPWORDS = frozenset(
+    "a an and are as at be by could e for g from if in into is it may might "
+    "of on or the this to with".split())
+
+
+def tokenize(text):
+    """Lower-case alphanumeric tokens of `text`, without common stop words."""
+    return [token for token in _TOKEN.findall(str(text).lower())
+            if token not in _STOPWORDS]
+
+
+class RiskSearchIndex:
+    """Inverted index from tokens to {Risk ID: field-weighted token count}."""
+
+    def __init__(self):
+        self._postings = {}
+        self._documents = {}
+        self._vocabulary = None
+
+    def __len__(self):
+        return len(self._documents)
+
+    def __contains__(self, risk_id):
+        return risk_id in self._documents
+
+    def add(self, risk_id, fields):
+        """Index (or re-index) one risk; `fields` maps column name to text."""
+        self.remove(risk_id)
+        counts = Counter()
+        for column, weight in SEARCH_FIELDS.items():
+            for token in tokenize(fields.get(column, "")):
+                counts[token] += weight
+        self._documents[risk_id] = counts
+        for token, count in counts.items():
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = {}
+                self._vocabulary = None
+            postings[risk_id] = count
+
+    def remove(self, risk_id):
+        counts = self._documents.pop(risk_id, None)
+        if counts is None:
+            return
+        for token in counts:
+            postings = self._postings[token]
+            del postings[risk_id]
+            if not postings:
+                del self._postings[token]
+                self._vocabulary = None
+
+    def _expand(self, prefix):
+        """Indexed tokens starting with `prefix`."""
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self._postings)
+        start = bisect.bisect_left(self._vocabulary, prefix)
+        end = bisect.bisect_left(self._vocabulary, prefix + "\uffff", start)
+        return self._vocabulary[start:end]
+
+    def search(self, query, limit=20):
+        """The best `limit` matches for `query` as (Risk ID, score) pairs, best first.
+
+        Risks must match every query token; the last token may match as a
+        prefix. Ties keep the order the risks were indexed in.
+        """
+        tokens = tokenize(query)
+        if not tokens or not self._documents:
+            return []
+        total = len(self._documents)
+        # (idf, postings) for each token's expansions; the last token matches as a prefix.
+        terms = []
+        for i, token in enumerate(tokens):
+            if i == len(tokens) - 1 and not query[-1:].isspace():
+                expansions = self._expand(token)
+            else:
+                expansions = [token] if token in self._postings else []
+            if not expansions:
+                return []
+            terms.append([(math.log1p(total / len(self._postings[expansion])),
+                           self._postings[expansion]) for expansion in expansions])
+        # Start from the rarest token so later tokens only probe its matches.
+        terms.sort(key=lambda term: sum(len(postings) for _, postings in term))
+        scores = {}
+        for idf, postings in terms[0]:
+            for risk_id, count in postings.items():
+                scores[risk_id] = scores.get(risk_id, 0.0) + count * idf
+        for term in terms[1:]:
+            if len(term) == 1:
+                (idf, postings), = term
+                scores = {risk_id: score + postings[risk_id] * idf
+                          for risk_id, score in scores.items() if risk_id in postings}
+            else:
+                matched = {}
+                for risk_id, score in scores.items():
+                    extra = sum(postings.get(risk_id, 0.0) * idf for idf, postings in term)
+                    if extra:
+                        matched[risk_id] = score + extra
+                scores = matched
+            if not scores:
+                return []
+        return heapq.nlargest(limit, scores.items(), key=operator.itemgetter(1))
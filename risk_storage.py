@@ -0,0 +1,461 @@
+"""Persistent storage backends for risk registers.
+
+A `RegisterStore` keeps named registers across restarts. `save` writes back
+only the risks changed since the previous save (see
+`RiskRegister.unsaved_changes`) and appends the register's audit events (see
+`risk_events`) to the register's append-only log, all in one transaction.
+Every `SNAPSHOT_INTERVAL` events it also stores a snapshot of the whole
+register. `load` rebuilds a register from its latest snapshot plus the
+events logged after it.
+
+A stored register can be shared by several writers, one in-memory register
+each. Concurrency is optimistic: every stored risk carries a row version, and
+`save` refuses with `RegisterConflictError` when a risk it would write or
+remove was changed by another writer since this one last read it. `pull`
+applies the events other writers logged since. Risk IDs come from a central
+counter per register that leases blocks (`allocate_ids`), so writers add
+risks without coordinating. IDs are unique but can have gaps.
+
+`SQLiteRegisterStore` keeps every register in one local SQLite file in WAL
+mode, so readers in other sessions are not blocked while a save commits.
+Risks are keyed by (register, Risk ID), with secondary indexes on Dimension
+and Status; the `risks` table always holds each register's current rows, so
+it can be queried directly. `open_store` picks the backend from the
+RISK_REGISTER_STORE environment variable.
+"""
+import abc
+import functools
+import os
+import sqlite3
+import threading
+
+import pandas as pd
+
+from risk_events import SNAPSHOT_INTERVAL, RiskEvent, decode_snapshot, encode_snapshot
+from risk_register import REGISTER_COLUMNS, RiskRegister, RiskRegisterError, risk_number
+from risk_scale import SCALES
+
+
+# Register column -> SQL column.
+_SQL_COLUMNS = {column: column.lower().replace(" ", "_") for column in REGISTER_COLUMNS}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS registers (
+    name TEXT PRIMARY KEY,
+    scale TEXT NOT NULL,
+    next_risk_id INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS risks (
+    register TEXT NOT NULL,
+    risk_id TEXT NOT NULL,
+    risk_number INTEGER NOT NULL,
+    dimension TEXT NOT NULL,
+    category TEXT,
+    description TEXT,
+    potential_impact TEXT NOT NULL,
+    likelihood TEXT NOT NULL,
+    risk_score INTEGER NOT NULL,
+    mitigation_strategy TEXT,
+    responsible_party TEXT,
+    status TEXT NOT NULL,
+    row_version INTEGER NOT NULL,
+    PRIMARY KEY (register, risk_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS risks_by_dimension ON risks (register, dimension);
+CREATE INDEX IF NOT EXISTS risks_by_status ON risks (register, status);
+CREATE TABLE IF NOT EXISTS dependencies (
+    register TEXT NOT NULL,
+    parent TEXT NOT NULL,
+    child TEXT NOT NULL,
+    weight REAL NOT NULL,
+    PRIMARY KEY (register, parent, child)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS events (
+    register TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    timestamp INTEGER NOT NULL,
+    action TEXT NOT NULL,
+    operation TEXT NOT NULL,
+    data TEXT NOT NULL,
+    writer TEXT NOT NULL,
+    PRIMARY KEY (register, seq)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS snapshots (
+    register TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    rows BLOB NOT NULL,
+    history BLOB NOT NULL,
+    meta BLOB NOT NULL,
+    PRIMARY KEY (register, seq)
+);
+"""
+
+# Risk IDs per SQLite statement when reading row versions.
+_ID_BATCH = 500
+
+# Events that write risks rather than dependency edges.
+_ROW_EVENTS = frozenset(["insert", "update", "delete", "reinsert"])
+
+
+class RegisterConflictError(RiskRegisterError):
+    """Raised by `save` when other writers changed risks this register also changed."""
+
+    def __init__(self, risk_ids):
+        self.risk_ids = list(risk_ids)
+        super().__init__(
+            f"Risk(s) {', '.join(self.risk_ids)} were changed by another analyst "
+            "since this register last synced with the store.")
+
+
+class RegisterStore(abc.ABC):
+    """Interface of a register storage backend."""
+
+    @abc.abstractmethod
+    def load(self, name, **register_args):
+        """The stored register `name` as a RiskRegister, or None if there is none.
+
+        `register_args` are passed to `RiskRegister.from_frame`; a stored
+        scale takes precedence over a `scale` argument.
+        """
+
+    @abc.abstractmethod
+    def create(self, name, register):
+        """Store `register` as new register `name`; returns False if `name` already exists.
+
+        Once stored, the register allocates its Risk IDs from the store.
+        """
+
+    @abc.abstractmethod
+    def save(self, name, register):
+        """Write the changes to `register` since its last save under `name`.
+
+        Raises RegisterConflictError, writing nothing, if another writer
+        changed any of the same risks or dependencies first. The register
+        then has to be reloaded; its unsaved changes are lost.
+        """
+
+    @abc.abstractmethod
+    def pull(self, name, register):
+        """Apply the events other writers logged since `register` last synced; returns how many.
+
+        A register with unsaved changes is left as it is. Applying other
+        writers' events discards the register's undo and redo history.
+        """
+
+    @abc.abstractmethod
+    def allocate_ids(self, name, count):
+        """Reserve `count` consecutive Risk numbers of register `name`; returns the first."""
+
+    @abc.abstractmethod
+    def events(self, name, since=0, limit=None):
+        """Logged events of register `name` after sequence number `since`, as (seq, RiskEvent) pairs."""
+
+    @abc.abstractmethod
+    def recent_events(self, name, limit=100):
+        """The last `limit` logged events of register `name`, oldest first."""
+
+    def close(self):
+        pass
+
+
+class SQLiteRegisterStore(RegisterStore):
+    """Registers in a local SQLite database file in WAL mode.
+
+    One connection is shared by every session of the process and serialized
+    with a lock; SQLite's own locking covers other processes using the file.
+    """
+
+    def __init__(self, path, timeout=30.0):
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            path, timeout=timeout, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(_SCHEMA)
+
+    def load(self, name, **register_args):
+        with self._lock:
+            connection = self._connection
+            # One read transaction, so rows, events and row versions agree.
+            connection.execute("BEGIN")
+            try:
+                meta = connection.execute(
+                    "SELECT scale, next_risk_id FROM registers WHERE name = ?", (name,)).fetchone()
+                if meta is None:
+                    return None
+                snapshot = connection.execute(
+                    "SELECT seq, rows, history, meta FROM snapshots WHERE register = ? "
+                    "ORDER BY seq DESC LIMIT 1", (name,)).fetchone()
+                if snapshot is None:
+                    rows = pd.read_sql_query(
+                        f"SELECT {', '.join(_SQL_COLUMNS.values())} FROM risks "
+                        "WHERE register = ? ORDER BY risk_number",
+                        connection, params=(name,))
+                    edges = connection.execute(
+                        "SELECT parent, child, weight FROM dependencies WHERE register = ?",
+                        (name,)).fetchall()
+                else:
+                    records = self._select_events(name, snapshot[0])
+                versions = self._row_versions(name)
+                last_seq = self._last_seq(name)
+            finally:
+                connection.execute("COMMIT")
+        register_args.update(scale=SCALES[meta[0]], log_events=True,
+                             id_allocator=functools.partial(self.allocate_ids, name))
+        if snapshot is None:
+            rows.columns = REGISTER_COLUMNS
+            register = RiskRegister.from_frame(rows, meta[1], dependencies=edges, **register_args)
+        else:
+            seq, *fields = snapshot
+            rows, history, next_risk_id, edges = decode_snapshot(
+                dict(zip(("rows", "history", "meta"), fields)))
+            register = RiskRegister.from_frame(
+                rows, next_risk_id, dependencies=edges, **register_args)
+            register.history.append(history["risk_number"], history["impact_code"],
+                                    history["likelihood_code"], history["score"],
+                                    history["timestamp"])
+            register.apply_events(RiskEvent.decode(*fields) for _, _, *fields in records)
+            register.mark_saved()
+        register.row_versions = versions
+        register.synced_seq = last_seq
+        return register
+
+    def events(self, name, since=0, limit=None):
+        with self._lock:
+            records = self._select_events(name, since, limit)
+        return [(seq, RiskEvent.decode(*fields)) for seq, _, *fields in records]
+
+    def recent_events(self, name, limit=100):
+        with self._lock:
+            records = self._connection.execute(
+                "SELECT seq, timestamp, action, operation, data FROM events "
+                "WHERE register = ? ORDER BY seq DESC LIMIT ?", (name, limit)).fetchall()
+        return [(seq, RiskEvent.decode(*fields)) for seq, *fields in reversed(records)]
+
+    def allocate_ids(self, name, count):
+        with self._lock:
+            # A single UPDATE is atomic, so concurrent writers get disjoint blocks.
+            row, = self._connection.execute(
+                "UPDATE registers SET next_risk_id = next_risk_id + ? WHERE name = ? "
+                "RETURNING next_risk_id", (count, name)).fetchall() or [None]
+        if row is None:
+            raise RiskRegisterError(f"No stored register '{name}'.")
+        return row[0] - count
+
+    def create(self, name, register):
+        changed, removed = register.unsaved_changes()
+        versions = [1] * len(changed)
+        with self._lock:
+            connection = self._connection
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                exists = connection.execute(
+                    "SELECT 1 FROM registers WHERE name = ?", (name,)).fetchone() is not None
+                if not exists:
+                    seqs = self._write(name, register, changed, removed, versions,
+                                       register.unsaved_events(), rewrite_dependencies=True)
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+        if exists:
+            return False
+        self._mark_saved(register, changed, removed, versions, seqs)
+        register.id_allocator = functools.partial(self.allocate_ids, name)
+        return True
+
+    def save(self, name, register):
+        if not register.has_unsaved_changes():
+            return
+        changed, removed = register.unsaved_changes()
+        events = register.unsaved_events()
+        risk_ids = changed["Risk ID"].tolist() + removed
+        with self._lock:
+            connection = self._connection
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                stored = self._row_versions(name, risk_ids)
+                conflicts = [risk_id for risk_id in risk_ids
+                             if stored.get(risk_id) != register.row_versions.get(risk_id)]
+                conflicts += self._dependency_conflicts(name, register, events)
+                if conflicts:
+                    raise RegisterConflictError(sorted(set(conflicts)))
+                versions = [stored.get(risk_id, 0) + 1 for risk_id in risk_ids[:len(changed)]]
+                seqs = self._write(
+                    name, register, changed, removed, versions, events,
+                    rewrite_dependencies=register.dependencies_unsaved and not register.log_events)
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+        self._mark_saved(register, changed, removed, versions, seqs)
+
+    def pull(self, name, register):
+        if register.has_unsaved_changes():
+            return 0
+        with self._lock:
+            connection = self._connection
+            connection.execute("BEGIN")
+            try:
+                records = self._select_events(name, register.synced_seq)
+                foreign = [RiskEvent.decode(*fields)
+                           for _, writer, *fields in records if writer != register.writer_id]
+                touched = sorted({risk_id for event in foreign if event.operation in _ROW_EVENTS
+                                  for risk_id in event.risk_ids()})
+                versions = self._row_versions(name, touched)
+            finally:
+                connection.execute("COMMIT")
+        if not records:
+            return 0
+        register.apply_events(foreign)
+        if foreign:
+            # Undo records hold values and positions from before the other
+            # writers' events; replaying one would silently revert their edit.
+            register.discard_undo_history()
+        register.mark_saved()
+        for risk_id in touched:
+            if risk_id in versions:
+                register.row_versions[risk_id] = versions[risk_id]
+            else:
+                register.row_versions.pop(risk_id, None)
+        register.synced_seq = records[-1][0]
+        return len(foreign)
+
+    # The helpers below run inside the caller's transaction, with the lock held.
+
+    def _select_events(self, name, since, limit=None):
+        """(seq, writer, timestamp, action, operation, data) records after `since`."""
+        query = ("SELECT seq, writer, timestamp, action, operation, data FROM events "
+                 "WHERE register = ? AND seq > ? ORDER BY seq")
+        params = (name, since)
+        if limit is not None:
+            query += " LIMIT ?"
+            params += (limit,)
+        return self._connection.execute(query, params).fetchall()
+
+    def _last_seq(self, name):
+        return self._connection.execute(
+            "SELECT coalesce(max(seq), 0) FROM events WHERE register = ?", (name,)).fetchone()[0]
+
+    def _row_versions(self, name, risk_ids=None):
+        """{Risk ID: stored row version} for `risk_ids` (default: every risk) that are stored."""
+        if risk_ids is None:
+            return dict(self._connection.execute(
+                "SELECT risk_id, row_version FROM risks WHERE register = ?", (name,)))
+        versions = {}
+        for i in range(0, len(risk_ids), _ID_BATCH):
+            batch = risk_ids[i:i + _ID_BATCH]
+            versions.update(self._connection.execute(
+                "SELECT risk_id, row_version FROM risks WHERE register = ? "
+                f"AND risk_id IN ({', '.join('?' * len(batch))})", (name, *batch)))
+        return versions
+
+    def _dependency_conflicts(self, name, register, events):
+        """Risk IDs of this register's dependency edits if another writer edited dependencies since it synced."""
+        edits = [event for event in events if event.operation not in _ROW_EVENTS]
+        if not edits:
+            return []
+        concurrent, = self._connection.execute(
+            "SELECT count(*) FROM events WHERE register = ? AND seq > ? AND writer != ? "
+            "AND operation IN ('depend', 'undepend')",
+            (name, register.synced_seq, register.writer_id)).fetchone()
+        return [risk_id for event in edits for risk_id in event.risk_ids()] if concurrent else []
+
+    def _write(self, name, register, changed, removed, versions, events, rewrite_dependencies):
+        """Write rows, dependencies and events; returns the last event seq before and after."""
+        connection = self._connection
+        records = list(zip(
+            [name] * len(changed),
+            [risk_number(risk_id) for risk_id in changed["Risk ID"]],
+            *(changed[column].astype(object).tolist() for column in REGISTER_COLUMNS),
+            versions))
+        sql_columns = ", ".join(_SQL_COLUMNS.values())
+        connection.execute(
+            "INSERT INTO registers (name, scale, next_risk_id) VALUES (?, ?, ?) "
+            "ON CONFLICT (name) DO UPDATE SET scale = excluded.scale, "
+            "next_risk_id = max(next_risk_id, excluded.next_risk_id)",
+            (name, register.scale.name, register.next_risk_id))
+        connection.executemany(
+            "DELETE FROM risks WHERE register = ? AND risk_id = ?",
+            [(name, risk_id) for risk_id in removed])
+        connection.executemany(
+            f"INSERT OR REPLACE INTO risks (register, risk_number, {sql_columns}, row_version) "
+            f"VALUES ({', '.join('?' * (len(_SQL_COLUMNS) + 3))})", records)
+        if rewrite_dependencies:
+            connection.execute("DELETE FROM dependencies WHERE register = ?", (name,))
+            connection.executemany(
+                "INSERT INTO dependencies (register, parent, child, weight) "
+                "VALUES (?, ?, ?, ?)", [(name, *edge) for edge in register.dependencies.edges()])
+        else:
+            # Replay only this writer's edits, keeping other writers' edges.
+            for event in events:
+                if event.operation == "depend":
+                    connection.execute(
+                        "INSERT OR REPLACE INTO dependencies (register, parent, child, weight) "
+                        "VALUES (?, ?, ?, ?)",
+                        (name, event.data["parent"], event.data["child"], event.data["weight"]))
+                elif event.operation == "undepend":
+                    connection.execute(
+                        "DELETE FROM dependencies WHERE register = ? AND parent = ? AND child = ?",
+                        (name, event.data["parent"], event.data["child"]))
+        return self._append_events(name, register, events)
+
+    def _append_events(self, name, register, events):
+        """Log `events` after the register's last one and snapshot when due; returns the seq before and after."""
+        connection = self._connection
+        previous_seq = self._last_seq(name)
+        connection.executemany(
+            "INSERT INTO events (register, seq, timestamp, action, operation, data, writer) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [(name, previous_seq + i, event.timestamp, event.action, event.operation,
+              event.encode(), register.writer_id)
+             for i, event in enumerate(events, 1)])
+        last_seq = previous_seq + len(events)
+        snapshot_seq = connection.execute(
+            "SELECT max(seq) FROM snapshots WHERE register = ?", (name,)).fetchone()[0]
+        # A snapshot stands for the log up to its seq, so only a writer with
+        # every earlier event applied can take one. A register that does not
+        # log events can only be saved as a whole.
+        if not register.log_events or (
+                register.synced_seq == previous_seq and
+                (snapshot_seq is None or last_seq - snapshot_seq >= SNAPSHOT_INTERVAL)):
+            snapshot = encode_snapshot(register)
+            connection.execute(
+                "INSERT OR REPLACE INTO snapshots (register, seq, rows, history, meta) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (name, last_seq, snapshot["rows"], snapshot["history"], snapshot["meta"]))
+            # Older snapshots are never read again; the event log itself is kept whole.
+            connection.execute(
+                "DELETE FROM snapshots WHERE register = ? AND seq < ?", (name, last_seq))
+        return previous_seq, last_seq
+
+    @staticmethod
+    def _mark_saved(register, changed, removed, versions, seqs):
+        register.row_versions.update(zip(changed["Risk ID"], versions))
+        for risk_id in removed:
+            register.row_versions.pop(risk_id, None)
+        # Other writers' events logged in between are still to be pulled.
+        previous_seq, last_seq = seqs
+        if register.synced_seq == previous_seq:
+            register.synced_seq = last_seq
+        register.mark_saved()
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+
+def open_store(spec=None):
+    """The store named by `spec` (default: the RISK_REGISTER_STORE variable), or None.
+
+    `spec` is "sqlite:<path>"; an empty spec means registers live in
+    session memory only.
+    """
+    spec = os.environ.get("RISK_REGISTER_STORE", "") if spec is None else spec
+    if not spec:
+        return None
+    backend, _, location = spec.partition(":")
+    if backend == "sqlite" and location:
+        return SQLiteRegisterStore(location)
+    raise ValueError(f"Unsupported register store '{spec}'.")
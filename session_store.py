@@ -0,0 +1,167 @@
+"""External storage for per-user session state.
+
+Streamlit keeps `st.session_state` in the memory of the process serving the
+browser tab, so a reconnect that lands on another replica starts from
+scratch. A `SessionStore` keeps selected session keys outside the process,
+under a session id the app carries in the page URL. Any replica can then
+pick the session up.
+
+`ExternalSessionState` mirrors those keys for one session. `hydrate` reads
+the stored keys the in-process state does not already hold, which means
+once per session per replica. `flush` writes only the keys whose value
+changed since they were last read or written. Values are pickled, so
+only trusted deployments should share a store.
+"""
+import abc
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+
+
+class SessionStore(abc.ABC):
+    """Interface of a session state backend."""
+
+    @abc.abstractmethod
+    def load(self, session_id):
+        """Every stored key of `session_id` as {key: pickled bytes}."""
+
+    @abc.abstractmethod
+    def save(self, session_id, values):
+        """Store {key: pickled bytes} for `session_id`, replacing those keys."""
+
+    def close(self):
+        pass
+
+
+class SQLiteSessionStore(SessionStore):
+    """Session keys in a local SQLite database file in WAL mode."""
+
+    def __init__(self, path, timeout=30.0):
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            path, timeout=timeout, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS session_state ("
+            "session_id TEXT NOT NULL, key TEXT NOT NULL, value BLOB NOT NULL, "
+            "PRIMARY KEY (session_id, key)) WITHOUT ROWID")
+
+    def load(self, session_id):
+        with self._lock:
+            return dict(self._connection.execute(
+                "SELECT key, value FROM session_state WHERE session_id = ?",
+                (session_id,)).fetchall())
+
+    def save(self, session_id, values):
+        if not values:
+            return
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                self._connection.executemany(
+                    "INSERT OR REPLACE INTO session_state (session_id, key, value) "
+                    "VALUES (?, ?, ?)",
+                    [(session_id, key, value) for key, value in values.items()])
+                self._connection.execute("COMMIT")
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+
+class FileSessionStore(SessionStore):
+    """Session keys as files, one directory per session and one file per key.
+
+    Each file is replaced atomically, so readers on other replicas sharing
+    the directory never see a partial value.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _session_dir(self, session_id):
+        return os.path.join(self.directory, session_id)
+
+    def load(self, session_id):
+        directory = self._session_dir(session_id)
+        if not os.path.isdir(directory):
+            return {}
+        values = {}
+        for name in os.listdir(directory):
+            if name.endswith(".pkl"):
+                with open(os.path.join(directory, name), "rb") as f:
+                    values[name[:-len(".pkl")]] = f.read()
+        return values
+
+    def save(self, session_id, values):
+        directory = self._session_dir(session_id)
+        os.makedirs(directory, exist_ok=True)
+        for key, value in values.items():
+            path = os.path.join(directory, f"{key}.pkl")
+            temporary = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temporary, "wb") as f:
+                f.write(value)
+            os.replace(temporary, path)
+
+
+def open_session_store(spec=None):
+    """The store named by `spec` (default: the SESSION_STORE variable), or None.
+
+    `spec` is "sqlite:<path>" or "file:<directory>"; an empty spec keeps
+    session state in process memory only.
+    """
+    spec = os.environ.get("SESSION_STORE", "") if spec is None else spec
+    if not spec:
+        return None
+    backend, _, location = spec.partition(":")
+    if backend == "sqlite" and location:
+        return SQLiteSessionStore(location)
+    if backend == "file" and location:
+        return FileSessionStore(location)
+    raise ValueError(f"Unsupported session store '{spec}'.")
+
+
+class ExternalSessionState:
+    """Mirror the keys of one session's state accepted by `persist` in a SessionStore."""
+
+    def __init__(self, store, session_id, persist):
+        self.store = store
+        self.session_id = session_id
+        self.persist = persist
+        # Digest of each key's pickled value as last read or written.
+        self._digests = {}
+
+    @staticmethod
+    def _digest(data):
+        return hashlib.blake2b(data, digest_size=16).digest()
+
+    def hydrate(self, state):
+        """Copy stored keys missing from `state` into it; returns the keys restored."""
+        restored = []
+        for key, data in self.store.load(self.session_id).items():
+            if key not in state and self.persist(key):
+                state[key] = pickle.loads(data)
+                self._digests[key] = self._digest(data)
+                restored.append(key)
+        return restored
+
+    def flush(self, state):
+        """Write the persisted keys of `state` that changed; returns the keys written."""
+        changed = {}
+        for key in list(state.keys()):
+            if not self.persist(key):
+                continue
+            data = pickle.dumps(state[key], protocol=pickle.HIGHEST_PROTOCOL)
+            if self._digests.get(key) != self._digest(data):
+                changed[key] = data
+        self.store.save(self.session_id, changed)
+        self._digests.update((key, self._digest(data)) for key, data in changed.items())
+        return list(changed)
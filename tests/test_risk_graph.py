@@ -0,0 +1,95 @@
+import random
+
+import pytest
+
+from risk_graph import RiskGraph, RiskGraphError
+from risk_register import RiskRegister, RiskRegisterError
+
+
+def full_recompute(graph, scores):
+    """Effective scores from scratch by repeated relaxation over every edge."""
+    effective = {risk_id: float(scores[risk_id])
+                 for edge in graph.edges() for risk_id in edge[:2] if risk_id in scores}
+    changed = True
+    while changed:
+        changed = False
+        for parent, child, weight in graph.edges():
+            if parent in effective and child in effective and weight * effective[parent] > effective[child]:
+                effective[child] = weight * effective[parent]
+                changed = True
+    return effective
+
+
+def test_scores_propagate_along_weighted_paths():
+    scores = {"R001": 9, "R002": 2, "R003": 1, "R004": 4}
+    graph = RiskGraph([("R001", "R002", 0.5), ("R002", "R003", 1.0), ("R004", "R003", 1.0)])
+    graph.propagate(scores.get)
+    assert graph.effective_scores() == {"R001": 9.0, "R002": 4.5, "R003": 4.5, "R004": 4.0}
+
+    scores["R001"] = 1
+    graph.mark(["R001"])
+    graph.propagate(scores.get)
+    assert graph.effective_scores() == {"R001": 1.0, "R002": 2.0, "R003": 4.0, "R004": 4.0}
+
+
+def test_propagation_stops_where_effective_scores_do_not_change():
+    scores = {"R001": 1, "R002": 9, "R003": 1}
+    graph = RiskGraph([("R001", "R002", 1.0), ("R002", "R003", 1.0)])
+    graph.propagate(scores.get)
+    scores["R001"] = 2
+    graph.mark(["R001"])
+    # R002 keeps its own 9, so R003 is not recomputed.
+    assert graph.propagate(scores.get) == 2
+    assert graph.effective_scores()["R003"] == 9.0
+
+
+def test_cycles_and_self_dependencies_are_rejected():
+    graph = RiskGraph([("R001", "R002", 1.0), ("R002", "R003", 1.0)])
+    with pytest.raises(RiskGraphError):
+        graph.add_edge("R003", "R001")
+    with pytest.raises(RiskGraphError):
+        graph.add_edge("R002", "R002")
+    assert sorted(graph.edges()) == [("R001", "R002", 1.0), ("R002", "R003", 1.0)]
+
+    register = RiskRegister(dependencies=graph.edges())
+    register.add_risks([{"dimension": "Data", "category": "c", "description": f"d{i}"}
+                        for i in range(3)])
+    with pytest.raises(RiskRegisterError):
+        register.add_dependency("R003", "R001")
+    register.assess("R001", "High", "High")
+    assert register.effective_scores().to_dict() == {"R001": 9.0, "R002": 9.0, "R003": 9.0}
+
+
+def test_removed_risks_pass_nothing_on():
+    register = RiskRegister(dependencies=[("R001", "R002", 1.0)])
+    register.add_risks([{"dimension": "Data", "category": "c", "description": f"d{i}"}
+                        for i in range(2)])
+    register.assess_many([("R001", "High", "High"), ("R002", "Low", "Low")])
+    assert register.effective_scores()["R002"] == 9.0
+    register.remove("R001")
+    assert register.effective_scores().to_dict() == {"R002": 1.0}
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_incremental_propagation_matches_full_recompute(seed):
+    rng = random.Random(seed)
+    risk_ids = [f"R{n:03d}" for n in range(1, 31)]
+    scores = {risk_id: rng.randint(1, 9) for risk_id in risk_ids}
+    graph = RiskGraph()
+    for _ in range(300):
+        op = rng.random()
+        if op < 0.4:
+            parent, child = rng.sample(risk_ids, 2)
+            try:
+                graph.add_edge(parent, child, rng.choice([0.5, 0.8, 1.0]))
+            except RiskGraphError:
+                pass
+        elif op < 0.5 and graph.edges():
+            graph.remove_edge(*rng.choice(graph.edges())[:2])
+        else:
+            risk_id = rng.choice(risk_ids)
+            scores[risk_id] = rng.randint(1, 9)
+            graph.mark([risk_id])
+        if rng.random() < 0.3:
+            graph.propagate(scores.get)
+            assert graph.effective_scores() == full_recompute(graph, scores)
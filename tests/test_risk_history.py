@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from risk_history import AssessmentHistory, dimension_trends, grouped_rolling_mean, risk_trends
+from risk_register import RiskRegister
+from risk_scale import DEFAULT_SCALE
+
+
+def day(n):
+    return pd.Timestamp("2024-01-01").value + n * 86_400 * 10**9
+
+
+def test_append_grows_and_reads_back():
+    history = AssessmentHistory(capacity=2)
+    history.append([1, 2, 3], [0, 1, 2], [2, 1, 0], [3, 4, 3], day(0))
+    history.append([1], [2], [2], [9], [day(1)])
+    assert len(history) == 4
+    frame = history.to_frame(DEFAULT_SCALE)
+    assert frame["Risk ID"].tolist() == ["R001", "R002", "R003", "R001"]
+    assert frame["Potential Impact"].tolist() == ["Low", "Medium", "High", "High"]
+    assert frame["Timestamp"].iloc[-1] == pd.Timestamp("2024-01-02")
+    with pytest.raises(ValueError):
+        history.column("score")[0] = 0
+
+
+def test_grouped_rolling_mean_matches_pandas():
+    rng = np.random.default_rng(0)
+    groups = np.sort(rng.integers(0, 20, 500))
+    values = rng.integers(1, 10, 500)
+    expected = (pd.Series(values, dtype=float).groupby(groups)
+                .rolling(3, min_periods=1).mean().to_numpy())
+    np.testing.assert_allclose(grouped_rolling_mean(groups, values, 3), expected)
+
+
+def test_risk_trends_roll_over_each_risks_own_ratings():
+    register = RiskRegister()
+    register.add_risks([{"dimension": "Data", "category": "Quality", "description": "Gaps"},
+                        {"dimension": "Model", "category": "Bias", "description": "Skew"}])
+    for impact in ("High", "Low", "High"):
+        register.assess("R001", impact, "High")
+    register.assess("R002", "Low", "Low")
+    trends = risk_trends(register.assessment_history(), window=2)
+    r001 = trends[trends["Risk ID"] == "R001"]
+    assert r001["Risk Score"].tolist() == [4, 9, 3, 9]
+    assert r001["Rolling Score"].tolist() == [4.0, 6.5, 6.0, 6.0]
+    assert trends[trends["Risk ID"] == "R002"]["Rolling Score"].tolist() == [4.0, 2.5]
+
+
+def test_dimension_trends_per_quarter_skip_removed_risks():
+    register = RiskRegister()
+    register.add_risks([{"dimension": "Data", "category": "Quality", "description": "Gaps"},
+                        {"dimension": "Data", "category": "Privacy", "description": "Leak"},
+                        {"dimension": "Model", "category": "Bias", "description": "Skew"}])
+    register.remove("R003")
+    register.history = AssessmentHistory()
+    register.history.append([1, 2, 1, 3], [2, 0, 0, 2], [2, 0, 0, 2], [9, 1, 1, 9],
+                            [day(0), day(10), day(100), day(100)])
+    trends = dimension_trends(register.assessment_history(), period="QS", window=2)
+    assert trends["Dimension"].astype(str).tolist() == ["Data", "Data"]
+    assert trends["Period"].tolist() == [pd.Timestamp("2024-01-01"), pd.Timestamp("2024-04-01")]
+    assert trends["Mean Score"].tolist() == [5.0, 1.0]
+    assert trends["Assessments"].tolist() == [2, 1]
+    assert trends["Rolling Mean Score"].tolist() == [5.0, 3.0]
@@ -0,0 +1,79 @@
+import io
+
+import pandas as pd
+import pytest
+
+from risk_import import RiskImportError, detect_columns, import_risks, map_columns
+from risk_register import RiskRegister
+
+
+ROWS = pd.DataFrame({
+    "Risk Type": ["Data", "model", "Nonsense", "System", "Human", "Data", "Model", "DATA"],
+    "Risk Statement": ["Gaps", "Skew", "Bad dimension", "Latency", "", "Leak", "Drift", "Stale"],
+    "Severity": ["High", "2", "Low", "low", "High", "Extreme", "3", ""],
+    "Probability": ["Low", "high", "Low", "1", "Low", "Low", "Medium", "Medium"],
+    "Risk Owner": ["Data Eng", "", "", "IT", "", "Privacy", "MRM", ""],
+    "Notes": ["x"] * 8,
+})
+
+
+def write(frame, tmp_path, fmt):
+    path = tmp_path / f"risks.{fmt}"
+    if fmt == "csv":
+        frame.to_csv(path, index=False)
+    else:
+        frame.to_parquet(path, index=False)
+    return path
+
+
+def test_aliases_are_detected_ignoring_case_and_punctuation():
+    assert detect_columns(["risk_type", "RISK STATEMENT", "Severity", "Owner", "Notes"]) == {
+        "dimension": "risk_type", "description": "RISK STATEMENT",
+        "potential_impact": "Severity", "responsible_party": "Owner"}
+
+
+def test_explicit_mapping_overrides_and_removes_columns():
+    columns = list(ROWS.columns)
+    mapping = map_columns(columns, {"category": "Notes", "responsible_party": None})
+    assert mapping["category"] == "Notes"
+    assert "responsible_party" not in mapping
+    with pytest.raises(RiskImportError):
+        map_columns(columns, {"owner": "Risk Owner"})
+    with pytest.raises(RiskImportError):
+        map_columns(columns, {"category": "Missing"})
+    with pytest.raises(RiskImportError):
+        map_columns(["Severity", "Notes"])
+
+
+def test_rejected_rows_are_numbered_across_chunks(tmp_path):
+    register = RiskRegister()
+    progress = []
+    report = import_risks(register, write(ROWS, tmp_path, "csv"), chunk_size=3,
+                          on_chunk=lambda report: progress.append(report.rows_read))
+    assert progress == [3, 6, 8]
+    assert report.rows_read == 8
+    assert report.rows_imported == 5
+    assert report.rejects == [(3, "Unknown Dimension"), (5, "Missing Description"),
+                              (6, "Unknown Potential Impact")]
+    assert register.df["Description"].tolist() == ["Gaps", "Skew", "Latency", "Drift", "Stale"]
+    assert register.df["Potential Impact"].tolist() == ["High", "Medium", "Low", "High", "Medium"]
+    assert register.df["Likelihood"].tolist() == ["Low", "High", "Low", "Medium", "Medium"]
+    assert register.df["Dimension"].tolist() == ["Data", "Model", "System", "Model", "Data"]
+    assert register.df["Responsible Party"].tolist()[2] == "IT"
+
+
+def test_parquet_and_csv_import_the_same_register(tmp_path):
+    registers = {}
+    for fmt in ("csv", "parquet"):
+        registers[fmt] = RiskRegister()
+        with open(write(ROWS, tmp_path, fmt), "rb") as handle:
+            report = import_risks(registers[fmt], handle, fmt=fmt, chunk_size=4)
+        assert (report.rows_imported, report.rows_rejected) == (5, 3)
+    pd.testing.assert_frame_equal(registers["csv"].df, registers["parquet"].df)
+
+
+def test_unknown_format_is_refused(tmp_path):
+    with pytest.raises(RiskImportError):
+        import_risks(RiskRegister(), tmp_path / "risks.xlsx")
+    with pytest.raises(RiskImportError):
+        import_risks(RiskRegister(), io.BytesIO(b""), fmt="xlsx")
@@ -0,0 +1,98 @@
+import pandas as pd
+import pytest
+
+from risk_register import RiskRegister, RiskRegisterError
+
+
+RISKS = [
+    {"dimension": "Data", "category": "Data Quality", "description": "Missing employment data"},
+    {"dimension": "Model", "category": "Algorithmic Bias", "description": "Amplified income bias"},
+    {"dimension": "System", "category": "Integration", "description": "Latency in loan system"},
+    {"dimension": "Human", "category": "Over-Reliance", "description": "Unreviewed approvals"},
+]
+
+
+@pytest.fixture
+def register():
+    register = RiskRegister()
+    register.add_risks(RISKS)
+    register.assess_many([("R001", "High", "Low"), ("R002", "Medium", "High"),
+                          ("R003", "Low", "Medium"), ("R004", "High", "High")])
+    return register
+
+
+def test_undo_whole_register_assessment_restores_scores(register):
+    before = register.df.copy()
+    register.assess_many([(risk_id, "Low", "Low") for risk_id in register.df["Risk ID"]])
+    assert register.undo()
+    pd.testing.assert_frame_equal(register.df, before)
+    register.check_rollups()
+
+
+def test_undo_single_row_assessment_restores_score():
+    register = RiskRegister()
+    register.add_risk("Data", "Data Quality", "Missing employment data")
+    before = register.df.copy()
+    register.assess("R001", "High", "High")
+    assert register.undo()
+    pd.testing.assert_frame_equal(register.df, before)
+    assert register.redo()
+    assert register.get("R001")["Risk Score"] == register.score("High", "High")
+
+
+def test_changes_since_reports_score_change(register):
+    snapshot = register.snapshot()
+    register.assess_many([(risk_id, "Low", "Low") for risk_id in register.df["Risk ID"]])
+    changes = register.changes_since(snapshot)
+    assert set(changes.loc[changes["Field"] == "Risk Score", "Risk ID"]) == {
+        "R001", "R002", "R003", "R004"}
+
+
+def test_classified_mitigation_on_insert_marks_mitigation_proposed():
+    from risk_rules import CREDIT_MODEL_RULES
+
+    register = RiskRegister(rules=CREDIT_MODEL_RULES, classify_on_insert=True)
+    risk_id = register.add_risk(
+        "Data", "Data Bias",
+        "Historical bias in income data could lead to unfair decisions, violating Fairness.")
+    row = register.get(risk_id)
+    assert row["Mitigation Strategy"] != "To be determined"
+    assert row["Status"] == "Mitigation Proposed"
+    register.check_rollups()
+
+
+def test_rated_by_rules_on_insert_marks_assessed():
+    from risk_rules import CREDIT_MODEL_RULES
+
+    register = RiskRegister(rules=CREDIT_MODEL_RULES, classify_on_insert=True)
+    rated, unmatched = register.add_risks([
+        {"dimension": "System", "category": "Integration Flaws", "description": "Latency"},
+        {"dimension": "System", "category": "Other", "description": "Unclear ownership"}])
+    assert register.get(rated)[["Potential Impact", "Likelihood", "Status"]].tolist() == [
+        "Medium", "Medium", "Assessed"]
+    assert register.get(unmatched)["Status"] == "Identified"
+    register.check_rollups()
+
+
+@pytest.mark.parametrize("description", ["", "   ", None])
+def test_single_and_bulk_adds_reject_blank_descriptions(description):
+    register = RiskRegister()
+    with pytest.raises(RiskRegisterError):
+        register.add_risk("Data", "Data Quality", description)
+    with pytest.raises(RiskRegisterError):
+        register.add_risks([{"dimension": "Data", "category": "Data Quality",
+                             "description": description}])
+    assert len(register) == 0
+
+
+def test_batch_naming_a_risk_twice_applies_and_records_its_last_entry(register):
+    history_rows = len(register.history)
+    assert register.assess_many([("R001", "Low", "Low"), ("R002", "Low", "High"),
+                                 ("R001", "Medium", "High")]) == 2
+    assert register.get("R001")["Potential Impact"] == "Medium"
+    history = register.assessment_history()
+    assert len(history) == history_rows + 2
+    r001 = history[history["Risk ID"] == "R001"]
+    assert r001["Potential Impact"].tolist()[-1] == "Medium"
+    assert r001["Risk Score"].tolist()[-1] == register.score("Medium", "High")
+    register.check_rollups()
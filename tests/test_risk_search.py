@@ -0,0 +1,65 @@
+import pytest
+
+from risk_register import RiskRegister
+from risk_search import RiskSearchIndex, tokenize
+
+
+def fields(category="", description="", mitigation=""):
+    return {"Category": category, "Description": description, "Mitigation Strategy": mitigation}
+
+
+@pytest.fixture
+def index():
+    index = RiskSearchIndex()
+    index.add("R001", fields("Data Bias", "Historical income bias in training data"))
+    index.add("R002", fields("Drift", "Income shifts degrade the model"))
+    index.add("R003", fields("Privacy", "Exposure of income and demographic data"))
+    index.add("R004", fields("Oversight", "Loan officers override decisions"))
+    return index
+
+
+def test_tokenize_drops_stop_words_and_punctuation():
+    assert tokenize("The model's drift, e.g. in Q3!") == ["model", "s", "drift", "q3"]
+
+
+def test_ranking_weighs_category_and_rarity(index):
+    # "bias" appears in R001's Category (weight 2) and Description.
+    assert [risk_id for risk_id, _ in index.search("bias")] == ["R001"]
+    ranked = index.search("income data")
+    assert [risk_id for risk_id, _ in ranked] == ["R001", "R003"]
+    assert ranked[0][1] > ranked[1][1]
+    # "income" is in three risks; ties keep indexing order.
+    assert [risk_id for risk_id, _ in index.search("income")] == ["R001", "R002", "R003"]
+
+
+def test_every_token_must_match_and_last_token_is_a_prefix(index):
+    assert [risk_id for risk_id, _ in index.search("income demo")] == ["R003"]
+    assert index.search("income demo ") == []
+    assert index.search("loan bias") == []
+    assert index.search("") == []
+
+
+def test_reindexing_an_edited_description_and_removing(index):
+    index.add("R002", fields("Drift", "Concept shift in applicant behaviour"))
+    assert [risk_id for risk_id, _ in index.search("income")] == ["R001", "R003"]
+    assert [risk_id for risk_id, _ in index.search("applicant")] == ["R002"]
+    index.remove("R003")
+    assert "R003" not in index
+    assert index.search("demographic") == []
+    assert [risk_id for risk_id, _ in index.search("income")] == ["R001"]
+
+
+def test_register_search_follows_writes_removes_and_undo():
+    register = RiskRegister()
+    register.add_risks([
+        {"dimension": "Data", "category": "Data Bias", "description": "Historical income bias"},
+        {"dimension": "Model", "category": "Drift", "description": "Recession degrades accuracy"}])
+    assert register.search("recession") == ["R002"]
+    register.mitigate("R002", "Quarterly recalibration", "Model Monitoring Team")
+    assert register.search("recalib") == ["R002"]
+    register.remove("R002")
+    assert register.search("recession") == []
+    assert register.undo()
+    assert register.search("recession") == ["R002"]
+    assert register.undo()
+    assert register.search("recalib") == []
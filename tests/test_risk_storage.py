@@ -0,0 +1,58 @@
+import pytest
+
+from risk_register import RiskRegister
+from risk_storage import RegisterStore, SQLiteRegisterStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SQLiteRegisterStore(str(tmp_path / "registers.db"))
+    register = RiskRegister()
+    register.add_risk("Data", "Data Quality", "Missing employment data")
+    register.add_risk("Model", "Algorithmic Bias", "Amplified income bias")
+    store.create("shared", register)
+    yield store
+    store.close()
+
+
+def test_pull_of_foreign_update_drops_undo_history(store):
+    first, second = store.load("shared"), store.load("shared")
+    first.assess("R002", "Low", "Low")
+    store.save("shared", first)
+    store.pull("shared", second)
+    second.assess("R002", "High", "High")
+    store.save("shared", second)
+
+    assert store.pull("shared", first)
+    assert first.get("R002")["Potential Impact"] == "High"
+    # Undoing the first analyst's assessment would revert the second one's.
+    assert not first.can_undo()
+    assert not first.undo()
+    assert first.get("R002")["Potential Impact"] == "High"
+
+
+def test_pull_of_own_events_keeps_undo_history(store):
+    register = store.load("shared")
+    register.assess("R001", "High", "Low")
+    store.save("shared", register)
+    store.pull("shared", register)
+    assert register.can_undo()
+
+
+def test_writers_lease_blocks_of_risk_ids(store):
+    first = store.load("shared")
+    second = store.load("shared", id_block_size=2)
+    assert first.add_risk("System", "Integration", "Latency in loan system") == "R003"
+    assert second.add_risk("Human", "Over-Reliance", "Unreviewed approvals") == "R103"
+    assert second.add_risks([{"dimension": "Data", "category": "Data Quality",
+                              "description": "Stale"}] * 2) == ["R105", "R106"]
+    assert first.add_risk("Data", "Data Quality", "Gaps") == "R004"
+
+
+def test_incomplete_backend_fails_on_instantiation():
+    class LoadOnlyStore(RegisterStore):
+        def load(self, name, **register_args):
+            return None
+
+    with pytest.raises(TypeError):
+        LoadOnlyStore()
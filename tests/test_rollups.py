@@ -0,0 +1,97 @@
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from risk_register import RiskRegister, RiskRegisterError
+from risk_scale import SCALES
+
+
+def check_consistent(register):
+    """Rollups, score order and the Risk ID index against a full recompute."""
+    register.check_rollups()
+    scores = register.df["Risk Score"].to_numpy()
+    expected = np.argsort(-scores.astype(np.int64), kind="stable")
+    np.testing.assert_array_equal(register.score_order(), expected)
+    assert {risk_id: register.position(risk_id) for risk_id in register.df["Risk ID"]} == {
+        risk_id: pos for pos, risk_id in enumerate(register.df["Risk ID"])}
+
+
+def random_write(register, rng, step):
+    levels = register.scale.impact_levels
+    risk_ids = list(register.df["Risk ID"])
+    op = rng.random()
+    if op < 0.2 or not risk_ids:
+        register.add_risk(rng.choice(["Data", "Model", "Human"]), "Category", f"Risk {step}")
+    elif op < 0.3:
+        register.add_risks([{"dimension": "System", "category": "Bulk", "description": f"Bulk {step}",
+                             "potential_impact": rng.choice(levels)} for _ in range(3)])
+    elif op < 0.55:
+        register.assess(rng.choice(risk_ids), rng.choice(levels), rng.choice(levels))
+    elif op < 0.7:
+        # Repeated IDs in one batch must be counted once.
+        register.assess_many([(rng.choice(risk_ids), rng.choice(levels), rng.choice(levels))
+                              for _ in range(4)])
+    elif op < 0.77:
+        register.assess_many([(risk_id, rng.choice(levels), rng.choice(levels))
+                              for risk_id in risk_ids])
+    elif op < 0.9:
+        register.mitigate(rng.choice(risk_ids), f"Mitigation {step}", "Owner")
+    else:
+        register.remove(rng.choice(risk_ids))
+
+
+class Oracle:
+    """Copies of the register after every write, to check what undo and redo restore."""
+
+    def __init__(self, register):
+        self.register = register
+        self.undo = [register.df.copy()]
+        self.redo = []
+
+    def edit(self, rng, step):
+        register = self.register
+        op = rng.random()
+        if op < 0.15:
+            if register.undo():
+                self.redo.append(self.undo.pop())
+        elif op < 0.25:
+            if register.redo():
+                self.undo.append(self.redo.pop())
+        else:
+            version = register.version
+            try:
+                random_write(register, rng, step)
+            except RiskRegisterError:
+                pass
+            if register.version != version:
+                self.undo.append(register.df.copy())
+                self.redo.clear()
+                # The register keeps only its last `history_limit` writes.
+                del self.undo[:-register.history_limit - 1]
+        pd.testing.assert_frame_equal(register.df.reset_index(drop=True), self.undo[-1],
+                                      check_dtype=False)
+
+
+@pytest.mark.parametrize("scale", ["3x3", "5x5"])
+@pytest.mark.parametrize("seed", range(3))
+def test_rollups_and_score_order_match_full_recompute(scale, seed):
+    rng = random.Random(seed)
+    oracle = Oracle(RiskRegister(scale=SCALES[scale]))
+    for step in range(150):
+        oracle.edit(rng, step)
+        # Reading only now and then lets several writes queue up between reads.
+        if rng.random() < 0.4:
+            check_consistent(oracle.register)
+    check_consistent(oracle.register)
+
+
+def test_single_risk_register_undo_redo():
+    oracle = Oracle(RiskRegister())
+    oracle.register.add_risk("Data", "Data Quality", "Missing employment data")
+    oracle.undo.append(oracle.register.df.copy())
+    rng = random.Random(1)
+    for step in range(100):
+        oracle.edit(rng, step)
+        check_consistent(oracle.register)
@@ -0,0 +1,59 @@
+import pytest
+
+from session_store import (
+    ExternalSessionState, FileSessionStore, SessionStore, SQLiteSessionStore, open_session_store
+)
+
+
+@pytest.fixture(params=["sqlite", "file"])
+def store(request, tmp_path):
+    if request.param == "sqlite":
+        store = open_session_store(f"sqlite:{tmp_path / 'sessions.db'}")
+        assert isinstance(store, SQLiteSessionStore)
+    else:
+        store = open_session_store(f"file:{tmp_path / 'sessions'}")
+        assert isinstance(store, FileSessionStore)
+    yield store
+    store.close()
+
+
+def persisted(key):
+    return not key.startswith("_")
+
+
+def test_flush_writes_only_changed_persisted_keys(store):
+    mirror = ExternalSessionState(store, "session-1", persisted)
+    state = {"page": 3, "filters": {"Dimension": ["Data"]}, "_widget": object()}
+    assert sorted(mirror.flush(state)) == ["filters", "page"]
+    assert mirror.flush(state) == []
+    state["page"] = 4
+    assert mirror.flush(state) == ["page"]
+
+
+def test_hydrate_restores_missing_keys_in_another_replica(store):
+    ExternalSessionState(store, "session-1", persisted).flush({"page": 4, "query": "bias"})
+    ExternalSessionState(store, "session-2", persisted).flush({"page": 9})
+
+    replica = ExternalSessionState(store, "session-1", persisted)
+    state = {"query": "drift"}
+    assert replica.hydrate(state) == ["page"]
+    assert state == {"page": 4, "query": "drift"}
+    # Values read back are not written again until they change.
+    assert replica.flush(state) == ["query"]
+    assert store.load("session-1").keys() == {"page", "query"}
+    assert store.load("unknown") == {}
+
+
+def test_open_session_store_specs():
+    assert open_session_store("") is None
+    with pytest.raises(ValueError):
+        open_session_store("redis:localhost")
+
+
+def test_incomplete_backend_fails_on_instantiation():
+    class LoadOnlyStore(SessionStore):
+        def load(self, session_id):
+            return {}
+
+    with pytest.raises(TypeError):
+        LoadOnlyStore()
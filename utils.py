@@ -1,24 +1,74 @@
 
+import io
+import json
+import os
+import re
+import secrets
+from collections import OrderedDict
+
+import numpy as np
 import pandas as pd
+import pyarrow as pa
 import streamlit as st
 import matplotlib.pyplot as plt
 import seaborn as sns
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.transforms import Bbox
+
+from risk_register import RiskRegister, RiskRegisterError, build_report
+from risk_events import events_frame
+from risk_graph import CREDIT_MODEL_DEPENDENCIES, DEFAULT_DEPENDENCY_WEIGHT
+from risk_history import TREND_PERIODS, dimension_trends, risk_trends
+from risk_import import COLUMN_ALIASES, detect_columns, detect_format, import_risks, source_columns
+from risk_rules import CREDIT_MODEL_RULES
+from risk_scale import SCALES
+from risk_storage import RegisterConflictError, open_store
+from session_store import ExternalSessionState, open_session_store
+
+# Name of the model's register in the store when RISK_REGISTER_STORE is set;
+# every session assessing the model shares it.
+REGISTER_NAME = "credit-risk-scoring-model"
+
+# URL query parameter carrying the session id when SESSION_STORE is set.
+SESSION_QUERY_PARAM = "session"
+_SESSION_ID = re.compile(r"[A-Za-z0-9_-]{16,64}")
+
+# Session state keys kept in the external session store. The register is
+# persisted by the register store; widget state and caches stay in process.
+SESSION_KEYS = frozenset([
+    "current_sidebar_page_index", "chart_renderer",
+    "credit_risk_model_scenario", "hypothetical_auc", "hypothetical_precision_at_recall",
+    "credit_risk_model_card", "synthetic_dataset_details", "credit_data_card",
+])
+_QUIZ_ANSWER_KEY = re.compile(r"(model|data|framework)_q\d+_answer")
+
+
+def _is_session_key(key):
+    return key in SESSION_KEYS or _QUIZ_ANSWER_KEY.fullmatch(key) is not None
 
 
 def initialize_app_state():
     """Initialize session state variables for the app."""
+    # Restore a session started on another replica before filling in defaults.
+    external_session_state()
     # Initialize session state variables if they don't exist
     if 'current_sidebar_page_index' not in st.session_state:
         # Corresponds to the index in the sidebar selectbox
         st.session_state.current_sidebar_page_index = 0
-    if 'risk_register_df' not in st.session_state:
-        st.session_state.risk_register_df = pd.DataFrame(columns=[
-            "Risk ID", "Dimension", "Category", "Description",
-            "Potential Impact", "Likelihood", "Risk Score",
-            "Mitigation Strategy", "Responsible Party", "Status"
-        ])
-    if 'next_risk_id' not in st.session_state:
-        st.session_state.next_risk_id = 1
+    if 'chart_renderer' not in st.session_state:
+        st.session_state.chart_renderer = "matplotlib"
+    if 'table_cache' not in st.session_state:
+        # Arrow tables for register table pages, most recently used last
+        st.session_state.table_cache = OrderedDict()
+    if 'chart_cache' not in st.session_state:
+        # Rendered chart PNGs, most recently used last
+        st.session_state.chart_cache = OrderedDict()
+    if 'risk_register' not in st.session_state:
+        st.session_state.risk_register = _open_register()
+    else:
+        # Pick up what other analysts saved to the shared register since the last run.
+        pull_register_changes()
 
     # --- Model Scenario and Card Initializations ---
     # These should ideally be initialized only once, so placing them in utils and checking session state is correct.
@@ -141,111 +191,887 @@ def initialize_app_state():
 
 
 # --- Helper functions for navigation (to be called from pages) ---
+@st.cache_resource
+def session_store():
+    """The process-wide session store from SESSION_STORE, or None (see session_store.open_session_store)."""
+    return open_session_store()
+
+
+def external_session_state():
+    """This session's ExternalSessionState, or None without a session store.
+
+    The session id comes from the URL, so a reconnect to any replica finds
+    the same stored state; a new id is issued when the URL has none.
+    """
+    store = session_store()
+    if store is None:
+        return None
+    external = st.session_state.get("external_session_state")
+    if external is None:
+        session_id = st.query_params.get(SESSION_QUERY_PARAM, "")
+        if not _SESSION_ID.fullmatch(session_id):
+            session_id = secrets.token_urlsafe(24)
+            st.query_params[SESSION_QUERY_PARAM] = session_id
+        external = ExternalSessionState(store, session_id, _is_session_key)
+        external.hydrate(st.session_state)
+        st.session_state.external_session_state = external
+    return external
+
+
+def save_session_state():
+    """Write the session keys this run changed to the session store, if there is one."""
+    external = external_session_state()
+    if external is not None:
+        external.flush(st.session_state)
+
+
+@st.cache_resource
+def register_store():
+    """The process-wide register store from RISK_REGISTER_STORE, or None (see risk_storage.open_store)."""
+    return open_store()
+
+
+def _open_register():
+    """The stored shared register, or a new one.
+
+    A new register's rating scale comes from the RISK_SCALE environment
+    variable ("3x3" or "5x5"); see risk_scale.SCALES. Risks added without
+    ratings, including imported ones, are classified by CREDIT_MODEL_RULES
+    as they are inserted.
+    """
+    store = register_store()
+    register = None
+    if store is not None:
+        register = store.load(REGISTER_NAME, rules=CREDIT_MODEL_RULES, classify_on_insert=True)
+    if register is None:
+        register = RiskRegister(
+            scale=SCALES[os.environ.get("RISK_SCALE", "3x3")],
+            rules=CREDIT_MODEL_RULES, classify_on_insert=True,
+            dependencies=CREDIT_MODEL_DEPENDENCIES, log_events=store is not None)
+        # Another session may have stored the register first; use theirs.
+        if store is not None and not store.create(REGISTER_NAME, register):
+            register = store.load(REGISTER_NAME, rules=CREDIT_MODEL_RULES, classify_on_insert=True)
+    return register
+
+
+def pull_register_changes():
+    """Apply the register changes other sessions saved since this one last synced."""
+    store = register_store()
+    if store is not None:
+        store.pull(REGISTER_NAME, st.session_state.risk_register)
+
+
+def save_register():
+    """Write the register's changes since the last save to the store, if there is one.
+
+    Called once at the end of every script run, so all writes of a run are
+    committed together. If another analyst changed the same risks first,
+    nothing is written: the register is reloaded with their changes and the
+    rerun shows the edits that were dropped (see `show_register_conflict`).
+    """
+    store = register_store()
+    if store is None or 'risk_register' not in st.session_state:
+        return
+    register = st.session_state.risk_register
+    try:
+        store.save(REGISTER_NAME, register)
+    except RegisterConflictError as e:
+        st.session_state.register_conflict = (str(e), register.unsaved_changes()[0])
+        st.session_state.risk_register = _open_register()
+        st.session_state.pop("risk_register_snapshot", None)
+        # Version-keyed entries of the old register would collide with the new one's.
+        st.session_state.table_cache.clear()
+        st.session_state.chart_cache.clear()
+        st.rerun()
+
+
+def show_register_conflict():
+    """Explain a save that conflicted with another analyst's, showing the dropped edits."""
+    conflict = st.session_state.get("register_conflict")
+    if conflict is None:
+        return
+    message, dropped = conflict
+    st.warning(f"{message} The register has been reloaded with their changes, "
+               "and your last changes were not saved. Please check them and apply "
+               "them again where they still hold.")
+    if not dropped.empty:
+        st.caption("Your unsaved values:")
+        st.dataframe(dropped, hide_index=True, use_container_width=True)
+    if st.button("Dismiss", key="register_conflict_dismiss_btn"):
+        del st.session_state.register_conflict
+        st.rerun()
+
+
+def show_audit_trail(limit=200):
+    """The most recent register events from the store's append-only log."""
+    store = register_store()
+    with st.expander("Audit Trail"):
+        if store is None:
+            st.info("Set RISK_REGISTER_STORE to keep an audit trail of register changes.")
+            return
+        events = store.recent_events(REGISTER_NAME, limit)
+        if not events:
+            st.info("No register changes recorded yet.")
+            return
+        st.caption(f"The last {len(events)} changes, oldest first.")
+        st.dataframe(events_frame(events), hide_index=True, use_container_width=True)
+
+
 def go_to_page(page_index):
     st.session_state.current_sidebar_page_index = page_index
     st.rerun()
 
+
+def get_risk_register_df():
+    """Return the current risk register as a DataFrame.
+
+    Pages should read the register through this helper rather than caching
+    the DataFrame across reruns, since writes may replace the underlying frame.
+    """
+    return st.session_state.risk_register.df
+
+
+def get_sorted_risk_register_df(sort_by):
+    """The register sorted by "Risk ID" or by "Risk Score" (highest first).
+
+    The ordering is maintained by the register and materialized once per
+    register version, so reruns that don't change the register don't re-sort.
+    """
+    if sort_by == "Risk ID":
+        return st.session_state.risk_register.sorted_by_id()
+    if sort_by == "Risk Score":
+        return st.session_state.risk_register.sorted_by_score()
+    raise ValueError(f"Unsupported sort column '{sort_by}'.")
+
+
+def get_risk_scale():
+    """The RiskScale used by this session's register."""
+    return st.session_state.risk_register.scale
+
+
+def get_risk(risk_id):
+    """Return the register row for `risk_id` as a Series, or None."""
+    return st.session_state.risk_register.get(risk_id)
+
 # --- Core Functions from Notebook ---
 
 
-def add_risk_to_register(dimension, category, description, potential_impact="Medium", likelihood="Medium"):
-    impact_map = {"Low": 1, "Medium": 2, "High": 3}
-    likelihood_map = {"Low": 1, "Medium": 2, "High": 3}
-
-    impact_score = impact_map.get(potential_impact, 0)
-    likelihood_score = likelihood_map.get(likelihood, 0)
-    risk_score = impact_score * likelihood_score
-
-    new_risk = {
-        "Risk ID": f"R{st.session_state.next_risk_id:03d}",
-        "Dimension": dimension,
-        "Category": category,
-        "Description": description,
-        "Potential Impact": potential_impact,
-        "Likelihood": likelihood,
-        "Risk Score": risk_score,
-        "Mitigation Strategy": "To be determined",
-        "Responsible Party": "TBD",
-        "Status": "Identified"
-    }
-    st.session_state.risk_register_df = pd.concat(
-        [st.session_state.risk_register_df, pd.DataFrame([new_risk])], ignore_index=True)
-    st.session_state.next_risk_id += 1
+def add_risk_to_register(dimension, category, description, potential_impact=None, likelihood=None):
+    try:
+        st.session_state.risk_register.add_risk(
+            dimension, category, description, potential_impact, likelihood)
+    except RiskRegisterError as e:
+        st.error(str(e))
+
+
+def add_risks_bulk(risks):
+    """Add many risks to the register in a single write.
+
+    See `RiskRegister.add_risks`. If any row is invalid nothing is added and
+    the problem is shown on the page. Returns the number of risks added.
+    """
+    try:
+        return len(st.session_state.risk_register.add_risks(risks))
+    except RiskRegisterError as e:
+        st.error(str(e))
+        return 0
+
+
+def import_column_mapping(uploaded_file, key_prefix):
+    """Selectboxes mapping register fields to the uploaded file's columns.
+
+    Defaults come from the column names (see risk_import.COLUMN_ALIASES).
+    Returns {field: column or None}, or None if the file cannot be read.
+    """
+    try:
+        columns = source_columns(uploaded_file, detect_format(uploaded_file.name))
+    except ValueError as e:
+        st.error(f"Could not read {uploaded_file.name}: {e}")
+        return None
+    detected = detect_columns(columns)
+    options = [None] + columns
+    mapping = {}
+    cols = st.columns(2)
+    for i, field in enumerate(COLUMN_ALIASES):
+        mapping[field] = cols[i % 2].selectbox(
+            field.replace("_", " ").title(), options,
+            index=options.index(detected.get(field)),
+            format_func=lambda column: "(not imported)" if column is None else column,
+            key=f"{key_prefix}_map_{field}")
+    return mapping
+
+
+def import_risks_from_file(uploaded_file, mapping=None):
+    """Import an uploaded CSV or Parquet register chunk by chunk, with a progress bar.
+
+    With a register store, each chunk is saved as soon as it is added. The
+    outcome is kept in session state for `show_import_report`; returns the
+    number of risks imported.
+    """
+    register = st.session_state.risk_register
+    store = register_store()
+    progress = st.progress(0.0, text=f"Importing {uploaded_file.name}...")
+    reports = []
+
+    def on_chunk(report):
+        reports[:] = [report]
+        if store is not None:
+            store.save(REGISTER_NAME, register)
+        progress.progress(report.fraction, text=f"{report.rows_imported:,} risks imported, "
+                          f"{report.rows_rejected:,} rows skipped")
+
+    try:
+        import_risks(register, uploaded_file, fmt=detect_format(uploaded_file.name),
+                     mapping=mapping, on_chunk=on_chunk)
+        error = None
+    except ValueError as e:
+        # Chunks added before the error stay in the register.
+        error = f"Import of {uploaded_file.name} stopped: {e}"
+    st.session_state.import_report = (uploaded_file.name, reports[0] if reports else None, error)
+    return reports[0].rows_imported if reports else 0
+
+
+def show_import_report():
+    """The outcome of the last file import, if any."""
+    if "import_report" not in st.session_state:
+        return
+    name, report, error = st.session_state.import_report
+    if report is not None:
+        st.success(f"Imported {report.rows_imported:,} risks from {report.rows_read:,} rows "
+                   f"of {name}.")
+        if report.rows_rejected:
+            st.warning(f"{report.rows_rejected:,} rows were skipped. The first of them:")
+            st.dataframe(report.rejects_frame(), hide_index=True, use_container_width=True)
+    if error is not None:
+        st.error(error)
 
 
 def assess_risk_severity(risk_id, potential_impact, likelihood):
-    impact_map = {"Low": 1, "Medium": 2, "High": 3}
-    likelihood_map = {"Low": 1, "Medium": 2, "High": 3}
-
-    idx = st.session_state.risk_register_df[st.session_state.risk_register_df["Risk ID"] == risk_id].index
-    if not idx.empty:
-        idx = idx[0]
-        st.session_state.risk_register_df.loc[idx,
-                                              "Potential Impact"] = potential_impact
-        st.session_state.risk_register_df.loc[idx, "Likelihood"] = likelihood
-
-        impact_score = impact_map.get(potential_impact, 0)
-        likelihood_score = likelihood_map.get(likelihood, 0)
-        st.session_state.risk_register_df.loc[idx,
-                                              "Risk Score"] = impact_score * likelihood_score
-        st.session_state.risk_register_df.loc[idx, "Status"] = "Assessed"
-        st.success(
-            f"Risk {risk_id} updated with Impact: {potential_impact}, Likelihood: {likelihood}, Score: {impact_score * likelihood_score}")
+    try:
+        risk_score = st.session_state.risk_register.assess(
+            risk_id, potential_impact, likelihood)
+    except RiskRegisterError as e:
+        st.error(str(e))
+        return
+    st.success(
+        f"Risk {risk_id} updated with Impact: {potential_impact}, Likelihood: {likelihood}, Score: {risk_score}")
+    register = st.session_state.risk_register
+    downstream = register.dependencies.downstream([risk_id]) - {risk_id}
+    if downstream:
+        scores = register.effective_scores()
+        st.info("Effective scores downstream: " + ", ".join(
+            f"{child} {scores[child]:g}" for child in sorted(downstream) if child in scores.index))
+
+
+def assess_risks_bulk(assessments):
+    """Apply many severity assessments as one all-or-nothing update.
+
+    `assessments` is an iterable of (risk_id, potential_impact, likelihood)
+    tuples. A single summary message is shown. Returns the number of risks
+    updated.
+    """
+    try:
+        count = st.session_state.risk_register.assess_many(assessments)
+    except RiskRegisterError as e:
+        st.error(str(e))
+        return 0
+    st.success(f"{count} risk assessment(s) applied.")
+    return count
+
+
+def auto_assess_risks():
+    """Assess every risk the register's rules match, as one update."""
+    try:
+        count = st.session_state.risk_register.auto_assess()
+    except RiskRegisterError as e:
+        st.error(str(e))
+        return 0
+    st.success(f"{count} risk(s) assessed by rule.")
+    return count
+
+
+def risk_search_picker(label, key, limit=50):
+    """A search box narrowing a Risk ID selectbox to the best keyword matches.
+
+    Matches come from the register's inverted index over Category,
+    Description and Mitigation Strategy, best first. With an empty query
+    every risk is listed in Risk ID order. Returns the selected Risk ID, or
+    None if nothing matches.
+    """
+    register = st.session_state.risk_register
+    query = st.text_input("Search risks", key=f"{key}_query",
+                          placeholder="Keywords from the category, description or mitigation")
+    if query.strip():
+        risk_ids = register.search(query, limit)
+        if not risk_ids:
+            st.info(f"No risks match '{query}'.")
+            return None
+    else:
+        risk_ids = register.sorted_by_id()["Risk ID"].tolist()
+    rows = register.df.iloc[[register.position(risk_id) for risk_id in risk_ids]]
+    labels = {risk_id: f"{risk_id} | {category}: {description[:80]}"
+              for risk_id, category, description in zip(
+                  risk_ids, rows["Category"], rows["Description"])}
+    return st.selectbox(label, options=risk_ids, format_func=labels.get, key=key)
+
+
+def add_risk_dependency(parent, child, weight=DEFAULT_DEPENDENCY_WEIGHT):
+    """Record that `parent` feeds `child`; returns False (with an on-page error) if rejected."""
+    try:
+        st.session_state.risk_register.add_dependency(parent, child, weight)
+    except RiskRegisterError as e:
+        st.error(str(e))
+        return False
+    return True
+
+
+def remove_risk_dependency(parent, child):
+    try:
+        st.session_state.risk_register.remove_dependency(parent, child)
+    except RiskRegisterError as e:
+        st.error(str(e))
+        return False
+    return True
+
+
+def show_risk_dependencies(key_prefix):
+    """The dependency edges with effective scores, plus controls to add or remove one."""
+    register = st.session_state.risk_register
+    with st.expander("Risk Dependencies"):
+        st.markdown("A risk's effective score is the larger of its own score and the "
+                    "weighted effective score of every risk that feeds it.")
+        edges = register.dependency_table()
+        if edges.empty:
+            st.info("No dependencies recorded.")
+        else:
+            st.dataframe(edges, hide_index=True, use_container_width=True)
+        risk_ids = register.df["Risk ID"].tolist()
+        col1, col2, col3 = st.columns([1, 1, 1])
+        parent = col1.selectbox("Upstream risk", options=risk_ids,
+                                key=f"{key_prefix}_dependency_parent")
+        child = col2.selectbox("Downstream risk", options=risk_ids,
+                               key=f"{key_prefix}_dependency_child")
+        weight = col3.number_input("Weight", min_value=0.0, value=DEFAULT_DEPENDENCY_WEIGHT,
+                                   step=0.1, key=f"{key_prefix}_dependency_weight")
+        col1, col2 = st.columns([1, 1])
+        if col1.button("Add Dependency", key=f"{key_prefix}_add_dependency_btn",
+                       use_container_width=True):
+            if add_risk_dependency(parent, child, weight):
+                st.rerun()
+        if col2.button("Remove Dependency", key=f"{key_prefix}_remove_dependency_btn",
+                       use_container_width=True):
+            if remove_risk_dependency(parent, child):
+                st.rerun()
+
+
+def undo_register_change():
+    """Undo the last write to the register; returns False if there was none."""
+    return st.session_state.risk_register.undo()
+
+
+def redo_register_change():
+    return st.session_state.risk_register.redo()
+
+
+def render_version_controls(key_prefix):
+    """Undo/redo buttons plus saving, comparing and restoring a register snapshot.
+
+    The saved snapshot is kept in session state, so it can be compared against
+    from any page that shows these controls.
+    """
+    register = st.session_state.risk_register
+    col1, col2, col3 = st.columns([1, 1, 2])
+    with col1:
+        if st.button("Undo", key=f"{key_prefix}_undo_btn", disabled=not register.can_undo(),
+                     use_container_width=True):
+            undo_register_change()
+            st.rerun()
+    with col2:
+        if st.button("Redo", key=f"{key_prefix}_redo_btn", disabled=not register.can_redo(),
+                     use_container_width=True):
+            redo_register_change()
+            st.rerun()
+    with col3:
+        if st.button("Save Snapshot", key=f"{key_prefix}_snapshot_btn", use_container_width=True):
+            st.session_state.risk_register_snapshot = register.snapshot()
+            st.success("Snapshot of the current register saved.")
+
+    snapshot = st.session_state.get("risk_register_snapshot")
+    if snapshot is None:
+        return
+    with st.expander("Compare to Saved Snapshot"):
+        try:
+            changes = register.changes_since(snapshot)
+        except RiskRegisterError as e:
+            st.warning(str(e))
+            return
+        if changes.empty:
+            st.info("No changes since the saved snapshot.")
+            return
+        st.dataframe(changes, use_container_width=True)
+        if st.button("Restore Snapshot", key=f"{key_prefix}_restore_btn"):
+            register.restore(snapshot)
+            st.rerun()
+
+
+CHART_CACHE_SIZE = 8
+TABLE_CACHE_SIZE = 16
+REGISTER_PAGE_SIZE = int(os.environ.get("REGISTER_PAGE_SIZE", "50"))
+CHART_DPI = 200
+RISK_MATRIX_FIGSIZE = (10, 8)
+# Above this many assessed risks the matrix switches from one point per risk
+# to a per-cell density heatmap.
+RISK_MATRIX_DENSITY_THRESHOLD = int(
+    os.environ.get("RISK_MATRIX_DENSITY_THRESHOLD", "200"))
+RISK_MATRIX_TOP_K = 3
+
+
+def _frame_cache_key(risk_df):
+    """Cache key for charts of `risk_df`: the register version, or a content hash.
+
+    Frames served by the session's register are keyed by its version, which is
+    free to check. Any other frame is hashed.
+    """
+    key = st.session_state.risk_register.cache_key(risk_df)
+    if key is None:
+        key = ("hash", len(risk_df),
+               int(pd.util.hash_pandas_object(risk_df, index=False).sum()))
+    return key
+
+
+def _cached(cache, key, build, max_size):
+    """The value cached under `key` in the LRU `cache`, built with `build()` on a miss."""
+    value = cache.get(key)
+    if value is None:
+        value = cache[key] = build()
+        while len(cache) > max_size:
+            cache.popitem(last=False)
+    else:
+        cache.move_to_end(key)
+    return value
+
+
+def _cached_chart(key, build):
+    """The chart artifact cached under `key`, built with `build()` on a miss.
+
+    Only the CHART_CACHE_SIZE most recently used artifacts are kept.
+    """
+    return _cached(st.session_state.chart_cache, key, build, CHART_CACHE_SIZE)
+
+
+def _render_png(draw, *args, figsize, dpi=None):
+    """Draw a new figure with `draw(fig, *args)` and rasterize it as PNG bytes.
+
+    `draw` may return the bounding box (in inches) to save; by default the
+    tight box is used. The figure is created and closed here, including when
+    `draw` raises, so figures never accumulate in pyplot's registry.
+    """
+    fig = plt.figure(figsize=figsize, dpi=dpi)
+    try:
+        bbox_inches = draw(fig, *args)
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format="png", dpi=CHART_DPI,
+                    bbox_inches="tight" if bbox_inches is None else bbox_inches)
+    finally:
+        plt.close(fig)
+    return buffer.getvalue()
+
+
+def _show_cached_chart(key, render):
+    """Show the chart PNG cached under `key`, rendering it with `render()` on a miss."""
+    st.image(_cached_chart(key, render), use_container_width=True)
+
+
+def show_register_table(risk_df, key, page_size=None):
+    """Show `risk_df` as a table, one page of REGISTER_PAGE_SIZE rows at a time.
+
+    Only the visible page is sent to the browser. Each page is converted to
+    an Arrow table once per register version (or content hash) and cached, so
+    reruns triggered by other widgets reuse it instead of re-serializing.
+    """
+    page_size = page_size or REGISTER_PAGE_SIZE
+    n_pages = max(-(-len(risk_df) // page_size), 1)
+    page = 1
+    if n_pages > 1:
+        page_key = f"{key}_page"
+        # Keep a stored page number valid after the register shrinks
+        if st.session_state.get(page_key, 1) > n_pages:
+            st.session_state[page_key] = n_pages
+        col1, col2 = st.columns([1, 3])
+        with col1:
+            page = st.number_input("Page", min_value=1, max_value=n_pages,
+                                   step=1, key=page_key)
+        start = (page - 1) * page_size
+        with col2:
+            st.caption(f"Rows {start + 1}-{min(start + page_size, len(risk_df))} "
+                       f"of {len(risk_df)} ({n_pages} pages)")
+
+    start = (page - 1) * page_size
+    table = _cached(
+        st.session_state.table_cache,
+        ("register_page", page, page_size) + _frame_cache_key(risk_df),
+        lambda: pa.Table.from_pandas(risk_df.iloc[start:start + page_size],
+                                     preserve_index=False),
+        TABLE_CACHE_SIZE)
+    st.dataframe(table, use_container_width=True)
+
+
+def show_register_rollups():
+    """Dimension x Status and Dimension x score band pivots of the session's register.
+
+    Both are read from counters the register keeps current on every write.
+    """
+    register = st.session_state.risk_register
+    col1, col2 = st.columns([1, 1])
+    with col1:
+        st.markdown("**Risks by Dimension and Status**")
+        st.dataframe(register.dimension_status_counts(), use_container_width=True)
+    with col2:
+        st.markdown("**Risks by Dimension and Score Band**")
+        st.dataframe(register.dimension_band_counts(), use_container_width=True)
+
+
+def show_score_trends(key_prefix, window=4):
+    """Line charts of one risk's score history and of mean score per Dimension over time.
+
+    Both read the register's assessment history, which records every rating.
+    """
+    history = st.session_state.risk_register.assessment_history()
+    if history.empty:
+        st.info("No assessments recorded yet.")
+        return
+    col1, col2 = st.columns([1, 1])
+    with col1:
+        risk_id = st.selectbox("Risk", options=history["Risk ID"].cat.categories,
+                               key=f"{key_prefix}_trend_risk")
+        trend = risk_trends(history[history["Risk ID"] == risk_id], window)
+        st.markdown(f"**Score history of {risk_id}** (rolling mean over {window} ratings)")
+        st.line_chart(trend, x="Timestamp", y=["Risk Score", "Rolling Score"])
+    with col2:
+        period = st.selectbox("Period", options=list(TREND_PERIODS), index=2,
+                              key=f"{key_prefix}_trend_period")
+        trends = dimension_trends(history, TREND_PERIODS[period], window)
+        st.markdown(f"**Mean score by Dimension** (rolling mean over {window} periods)")
+        st.line_chart(trends.pivot(index="Period", columns="Dimension",
+                                   values="Rolling Mean Score"))
+
+
+def chart_renderer_toggle(key):
+    """A toggle between server-rendered images and browser-rendered interactive charts.
+
+    The choice is kept in session state so it carries across pages.
+    """
+    interactive = st.toggle(
+        "Interactive charts (rendered in the browser)", key=key,
+        value=st.session_state.chart_renderer == "vega-lite",
+        help="Sends the chart data to the browser and draws it there, with hover details, "
+             "instead of rendering an image on the server.")
+    st.session_state.chart_renderer = "vega-lite" if interactive else "matplotlib"
+
+
+def _level_axis(levels, title):
+    """Vega-Lite axis putting rating level names at the cell centres 0.5, 1.5, ..."""
+    return {"title": title, "values": [i + 0.5 for i in range(len(levels))],
+            "labelExpr": f"{json.dumps(levels)}[floor(datum.value)]",
+            "grid": False}
+
+
+def _matrix_zones_layer(scale, x, y):
+    n_impact, n_likelihood = len(scale.impact_levels), len(scale.likelihood_levels)
+    zones = [{"x": j, "x2": j + 1, "y": i, "y2": i + 1,
+              "color": _risk_zone_color(i, j, n_impact, n_likelihood)}
+             for i in range(n_impact) for j in range(n_likelihood)]
+    return {
+        "data": {"values": zones},
+        "mark": {"type": "rect", "opacity": 0.15, "stroke": "gray", "strokeDash": [4, 4]},
+        "encoding": {"x": {**x, "field": "x"}, "x2": {"field": "x2"},
+                     "y": {**y, "field": "y"}, "y2": {"field": "y2"},
+                     "color": {"field": "color", "type": "nominal", "scale": None}},
+    }
+
+
+def _risk_matrix_spec(scale, mode):
+    """Vega-Lite spec for the matrix; the chart data is passed separately."""
+    n_impact, n_likelihood = len(scale.impact_levels), len(scale.likelihood_levels)
+    x = {"field": "Likelihood_Num", "type": "quantitative",
+         "scale": {"domain": [0, n_likelihood], "nice": False},
+         "axis": _level_axis(scale.likelihood_levels, "Likelihood")}
+    y = {"field": "Impact_Num", "type": "quantitative",
+         "scale": {"domain": [0, n_impact], "nice": False},
+         "axis": _level_axis(scale.impact_levels, "Potential Impact")}
+    if mode == "density":
+        data_layers = [
+            {"mark": {"type": "rect", "opacity": 0.8},
+             "encoding": {"x": {**x, "field": "x"}, "x2": {"field": "x2"},
+                          "y": {**y, "field": "y"}, "y2": {"field": "y2"},
+                          "color": {"field": "count", "type": "quantitative",
+                                    "scale": {"scheme": "viridis"}, "title": "Number of Risks"},
+                          "tooltip": [{"field": "count", "title": "Risks"},
+                                      {"field": "mean_score", "title": "Mean score", "format": ".1f"},
+                                      {"field": "top_ids", "title": "Top risks"}]}},
+            {"mark": {"type": "text", "fontSize": 11},
+             "transform": [{"calculate": "datum.x + 0.5", "as": "Likelihood_Num"},
+                           {"calculate": "datum.y + 0.5", "as": "Impact_Num"}],
+             "encoding": {"x": x, "y": y, "text": {"field": "label"}}},
+        ]
     else:
-        st.error(f"Risk ID {risk_id} not found.")
+        tooltip = ["Risk ID", "Category", "Potential Impact", "Likelihood",
+                   "Risk Score", "Status"]
+        data_layers = [
+            {"mark": {"type": "circle", "opacity": 0.8},
+             "encoding": {"x": x, "y": y,
+                          "color": {"field": "Risk Score", "type": "ordinal",
+                                    "scale": {"scheme": "viridis"}},
+                          "size": {"field": "Risk Score", "type": "quantitative",
+                                   "scale": {"range": [100, 1000]}},
+                          "tooltip": [{"field": field} for field in tooltip]}},
+            {"mark": {"type": "text", "align": "left", "dx": 8, "dy": -8, "fontSize": 10},
+             "encoding": {"x": x, "y": y, "text": {"field": "Risk ID"}}},
+        ]
+    return {
+        "title": "AI Model Risk Matrix: Credit Risk Scoring Model",
+        "height": 500,
+        "layer": [_matrix_zones_layer(scale, x, y)] + data_layers,
+    }
+
+
+def _risk_matrix_payload(risk_df, scale, mode):
+    """The compact table sent to the browser: one row per risk, or per cell in density mode."""
+    if mode == "density":
+        cells = _risk_matrix_cells(risk_df, scale).reset_index()
+        return pd.DataFrame({
+            "x": cells["likelihood"].to_numpy(), "x2": cells["likelihood"].to_numpy() + 1,
+            "y": cells["impact"].to_numpy(), "y2": cells["impact"].to_numpy() + 1,
+            "count": cells["count"].to_numpy(),
+            "mean_score": cells["mean_score"].to_numpy(),
+            "top_ids": cells["top_ids"].to_numpy(),
+            "label": cells["count"].astype(str).to_numpy() +
+                     np.where(cells["count"].to_numpy() == 1, " risk", " risks"),
+        })
+    layout = _risk_matrix_layout(risk_df, scale)
+    return pd.DataFrame({
+        "Risk ID": layout["Risk ID"].to_numpy(),
+        "Category": layout["Category"].to_numpy(),
+        "Potential Impact": layout["Potential Impact"].astype(str).to_numpy(),
+        "Likelihood": layout["Likelihood"].astype(str).to_numpy(),
+        "Risk Score": layout["Risk Score"].to_numpy(),
+        "Status": layout["Status"].astype(str).to_numpy(),
+        "Likelihood_Num": layout["Likelihood_Num"].to_numpy(),
+        "Impact_Num": layout["Impact_Num"].to_numpy(),
+    })
+
+
+def _risk_matrix_layout(risk_df, scale, radius=0.2):
+    """Matrix coordinates for every assessed risk in `risk_df`.
+
+    Returns the assessed rows (Risk Score > 0) with Likelihood_Num and
+    Impact_Num columns: the centre of the risk's cell, spread uniformly on a
+    circle of `radius` when several risks share a cell. Each risk's position
+    on the circle is its rank within the cell in register order, so the
+    layout is computed from cell sizes and ranks without a per-cell loop.
+    """
+    # RiskRegister._write updates its frame in place through .iloc, but under
+    # copy-on-write that copies any column still shared with this filtered
+    # frame, so the plot columns are added without a defensive copy. Only
+    # fresh arrays are cached (see _risk_matrix_payload), keyed by version.
+    risk_df_plot = risk_df[risk_df['Risk Score'] > 0]
 
+    impact_codes = scale.impact_codes(risk_df_plot["Potential Impact"])
+    likelihood_codes = scale.likelihood_codes(risk_df_plot["Likelihood"])
+    cell = pd.Series(impact_codes.astype(np.int64) * (len(scale.likelihood_levels) + 1)
+                     + likelihood_codes)
+    cell_size = cell.map(cell.value_counts()).to_numpy()
+    rank = cell.groupby(cell.to_numpy(), sort=False).cumcount().to_numpy()
 
-def plot_risk_matrix(risk_df):
-    import numpy as np
+    # Same angles as np.linspace(0, 2 * pi, cell_size, endpoint=False)[rank]
+    angles = rank * (2 * np.pi / cell_size)
+    spread = np.where(cell_size > 1, radius, 0.0)
+    return risk_df_plot.assign(
+        Likelihood_Num=(likelihood_codes + 0.5) + spread * np.cos(angles),
+        Impact_Num=(impact_codes + 0.5) + spread * np.sin(angles))
 
-    impact_order = ["Low", "Medium", "High"]
-    likelihood_order = ["Low", "Medium", "High"]
 
-    risk_df_plot = risk_df.copy()
-    # Filter out risks that haven't been assessed (Risk Score 0 if not assessed properly)
-    risk_df_plot = risk_df_plot[risk_df_plot['Risk Score'] > 0]
+def _risk_matrix_cells(risk_df, scale, top_k=RISK_MATRIX_TOP_K):
+    """Per-cell summary of the assessed risks in `risk_df`, from one groupby.
 
-    if risk_df_plot.empty:
+    Returns one row per occupied cell, indexed by impact and likelihood code,
+    with the number of risks, their mean score and the comma-separated IDs of
+    the `top_k` highest-scoring risks (ties in register order).
+    """
+    assessed = risk_df[risk_df['Risk Score'] > 0]
+    ranked = pd.DataFrame({
+        "impact": scale.impact_codes(assessed["Potential Impact"]),
+        "likelihood": scale.likelihood_codes(assessed["Likelihood"]),
+        "Risk ID": assessed["Risk ID"].to_numpy(),
+        "Risk Score": assessed["Risk Score"].to_numpy(),
+    }).sort_values("Risk Score", ascending=False, kind="stable")
+    return ranked.groupby(["impact", "likelihood"]).agg(
+        count=("Risk ID", "size"),
+        mean_score=("Risk Score", "mean"),
+        top_ids=("Risk ID", lambda ids: ", ".join(ids.iloc[:top_k])))
+
+
+def _draw_risk_density(fig, cells, scale):
+    """Heatmap of risk counts per cell, labelled with the cell summary only."""
+    n_impact, n_likelihood = len(scale.impact_levels), len(scale.likelihood_levels)
+    counts = np.zeros((n_impact, n_likelihood))
+    counts[cells.index.get_level_values("impact"),
+           cells.index.get_level_values("likelihood")] = cells["count"]
+
+    ax = fig.subplots()
+    mesh = ax.pcolormesh(np.arange(n_likelihood + 1), np.arange(n_impact + 1),
+                         np.ma.masked_equal(counts, 0), cmap="viridis", alpha=0.8)
+    fig.colorbar(mesh, ax=ax, label="Number of Risks")
+    for (i, j), cell in cells.iterrows():
+        ax.text(j + 0.5, i + 0.5,
+                f"{cell['count']} risk{'' if cell['count'] == 1 else 's'}\nMean score {cell['mean_score']:.1f}\n{cell['top_ids']}",
+                ha="center", va="center", fontsize=8,
+                bbox=dict(boxstyle="round", facecolor="white", alpha=0.7))
+
+    for x in range(1, n_likelihood):
+        ax.axvline(x=x, color='gray', linestyle='--', linewidth=0.8)
+    for y in range(1, n_impact):
+        ax.axhline(y=y, color='gray', linestyle='--', linewidth=0.8)
+    _label_matrix_axes(ax, scale)
+    ax.set_xlim(0, n_likelihood)
+    ax.set_ylim(0, n_impact)
+
+
+def plot_risk_matrix(risk_df, scale=None, mode="auto", renderer=None):
+    """Show the risk matrix, re-rendering only when the register or scale changes.
+
+    `mode` is "scatter" (one labelled point per risk), "density" (a heatmap of
+    per-cell counts labelled with each cell's top risks) or "auto", which
+    switches to density once more than RISK_MATRIX_DENSITY_THRESHOLD risks are
+    assessed. `renderer` is "matplotlib" (a server-rendered image) or
+    "vega-lite" (the coordinates are sent to the browser, which draws the
+    chart); it defaults to the session's choice.
+    """
+    scale = scale or get_risk_scale()
+    renderer = renderer or st.session_state.chart_renderer
+    # Risks that haven't been assessed (Risk Score 0) are not plotted
+    n_assessed = int((risk_df['Risk Score'] > 0).sum())
+    if not n_assessed:
         st.info(
             "No assessed risks to display in the matrix yet. Please assess some risks first.")
         return
+    if mode == "auto":
+        mode = "density" if n_assessed > RISK_MATRIX_DENSITY_THRESHOLD else "scatter"
+    if mode not in ("scatter", "density"):
+        raise ValueError(f"Unsupported risk matrix mode '{mode}'.")
+    if mode == "density":
+        st.caption(f"Showing risk density for {n_assessed} assessed risks, "
+                   f"labelled with the top {RISK_MATRIX_TOP_K} risks in each cell.")
+    key = (mode, scale.name) + _frame_cache_key(risk_df)
+    if renderer == "vega-lite":
+        payload = _cached_chart(("risk_matrix_data",) + key,
+                                lambda: _risk_matrix_payload(risk_df, scale, mode))
+        st.vega_lite_chart(payload, _risk_matrix_spec(scale, mode),
+                           use_container_width=True)
+        return
+    if renderer != "matplotlib":
+        raise ValueError(f"Unsupported chart renderer '{renderer}'.")
+
+    if mode == "density":
+        render = lambda: _render_png(
+            _draw_risk_density, _risk_matrix_cells(risk_df, scale), scale,
+            figsize=RISK_MATRIX_FIGSIZE)
+    else:
+        render = lambda: _render_png(
+            _draw_risk_matrix, _risk_matrix_layout(risk_df, scale), scale,
+            figsize=RISK_MATRIX_FIGSIZE, dpi=CHART_DPI)
+    _show_cached_chart(("risk_matrix",) + key, render)
+
 
-    # Map qualitative ratings to numerical for plotting
-    risk_df_plot["Impact_Num"] = risk_df_plot["Potential Impact"].map(
-        lambda x: impact_order.index(x) + 0.5)
-    risk_df_plot["Likelihood_Num"] = risk_df_plot["Likelihood"].map(
-        lambda x: likelihood_order.index(x) + 0.5)
-
-    # Add uniform spread to prevent overlapping points
-    # Initialize offset columns
-    risk_df_plot["offset_x"] = 0.0
-    risk_df_plot["offset_y"] = 0.0
-
-    # Group by same coordinates and spread them in a circular pattern
-    grouped = risk_df_plot.groupby(
-        ['Likelihood_Num', 'Impact_Num'], sort=False)
-
-    for (lik, imp), group in grouped:
-        n_points = len(group)
-        if n_points > 1:
-            # Distribute points uniformly in a circle
-            radius = 0.2  # Maximum offset from center
-            angles = np.linspace(0, 2 * np.pi, n_points, endpoint=False)
-            offsets_x = radius * np.cos(angles)
-            offsets_y = radius * np.sin(angles)
-
-            # Assign offsets to the correct indices
-            for i, idx in enumerate(group.index):
-                risk_df_plot.loc[idx, "offset_x"] = offsets_x[i]
-                risk_df_plot.loc[idx, "offset_y"] = offsets_y[i]
-
-    # Apply offsets
-    risk_df_plot["Likelihood_Num"] = risk_df_plot["Likelihood_Num"] + \
-        risk_df_plot["offset_x"]
-    risk_df_plot["Impact_Num"] = risk_df_plot["Impact_Num"] + \
-        risk_df_plot["offset_y"]
-
-    fig, ax = plt.subplots(figsize=(10, 8))
+RISK_ZONE_COLORS = ['lightgreen', 'green', 'yellow', 'orange', 'red']
+
+
+def _risk_zone_color(i, j, n_impact, n_likelihood):
+    """Background colour of impact row i, likelihood column j.
+
+    Each cell is banded by how far it sits towards the High Impact, High
+    Likelihood corner.
+    """
+    band = int(2 * (i / max(n_impact - 1, 1) +
+                    j / max(n_likelihood - 1, 1)) + 0.5)
+    return RISK_ZONE_COLORS[band]
+
+
+def _label_matrix_axes(ax, scale):
+    ax.set_xticks([j + 0.5 for j in range(len(scale.likelihood_levels))])
+    ax.set_xticklabels(scale.likelihood_levels)
+    ax.set_yticks([i + 0.5 for i in range(len(scale.impact_levels))])
+    ax.set_yticklabels(scale.impact_levels)
+    ax.set_xlabel("Likelihood")
+    ax.set_ylabel("Potential Impact")
+    ax.set_title("AI Model Risk Matrix: Credit Risk Scoring Model")
+
+
+# Static risk matrix backgrounds, rendered once per scale and shared by every
+# session: (RGBA pixels cropped to their tight bounding box, axes position, and the
+# crop's position in the figure).
+_MATRIX_BACKGROUNDS = {}
+
+
+def _risk_matrix_background(scale):
+    """The risk zones, grid, ticks and titles for `scale`, rendered once as pixels."""
+    background = _MATRIX_BACKGROUNDS.get(scale.name)
+    if background is not None:
+        return background
+
+    n_impact, n_likelihood = len(scale.impact_levels), len(scale.likelihood_levels)
+    # Built outside pyplot so it never enters the global figure registry
+    fig = Figure(figsize=RISK_MATRIX_FIGSIZE, dpi=CHART_DPI)
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.subplots()
+
+    # Set matrix grid
+    for x in range(1, n_likelihood):
+        ax.axvline(x=x, color='gray', linestyle='--', linewidth=0.8)
+    for y in range(1, n_impact):
+        ax.axhline(y=y, color='gray', linestyle='--', linewidth=0.8)
+
+    # Add background colors for risk levels
+    for i in range(n_impact):
+        for j in range(n_likelihood):
+            ax.axvspan(j, j + 1, ymin=i / n_impact, ymax=(i + 1) / n_impact,
+                       color=_risk_zone_color(i, j, n_impact, n_likelihood),
+                       alpha=0.15)
+
+    _label_matrix_axes(ax, scale)
+    ax.grid(False)  # Remove default grid to avoid overlap with custom lines
+    ax.set_xlim(0, n_likelihood)
+    ax.set_ylim(0, n_impact)
+
+    canvas.draw()
+    # Crop to the padded tight bounding box that savefig(bbox_inches="tight")
+    # would use, snapped to whole pixels
+    pixels = np.asarray(canvas.buffer_rgba())
+    height = pixels.shape[0]
+    bbox = fig.get_tightbbox(canvas.get_renderer()).padded(
+        plt.rcParams["savefig.pad_inches"])
+    x0, y0, x1, y1 = (round(v * CHART_DPI) for v in bbox.extents)
+    background = (pixels[height - y1:height - y0, x0:x1].copy(), ax.get_position(),
+                  Bbox.from_extents(x0, y0, x1, y1).transformed(fig.dpi_scale_trans.inverted()))
+    _MATRIX_BACKGROUNDS[scale.name] = background
+    return background
+
+
+def _draw_risk_matrix(fig, risk_df_plot, scale):
+    """Draw the risks over the cached static background for `scale`.
+
+    Only the data layer (points, legend and labels) is drawn per render, on a
+    transparent axes placed exactly over the background's axes. `fig` must be
+    RISK_MATRIX_FIGSIZE at CHART_DPI. Returns the bounding box (in inches) to
+    save it with.
+    """
+    pixels, position, crop = _risk_matrix_background(scale)
+    # Saved with the background's crop, the figure image is blitted 1:1 at
+    # the origin of the output
+    fig.figimage(pixels, zorder=-1)
+
+    ax = fig.add_axes(position)
+    ax.set_axis_off()
     sns.scatterplot(
         data=risk_df_plot,
         x="Likelihood_Num",
@@ -258,88 +1084,112 @@ def plot_risk_matrix(risk_df):
         ax=ax
     )
 
-    # Set matrix grid
-    ax.axvline(x=1, color='gray', linestyle='--', linewidth=0.8)
-    ax.axvline(x=2, color='gray', linestyle='--', linewidth=0.8)
-    ax.axhline(y=1, color='gray', linestyle='--', linewidth=0.8)
-    ax.axhline(y=2, color='gray', linestyle='--', linewidth=0.8)
-
-    # Add background colors for risk levels
-    # High Risk (Red)
-    ax.axvspan(2, 3, ymin=2/3, ymax=1, color='red',
-               alpha=0.15, label='High Risk')
-    # Medium-High Risk (Orange)
-    ax.axvspan(2, 3, ymin=1/3, ymax=2/3, color='orange', alpha=0.15)
-    ax.axvspan(1, 2, ymin=2/3, ymax=1, color='orange', alpha=0.15)
-    # Medium Risk (Yellow)
-    ax.axvspan(2, 3, ymin=0, ymax=1/3, color='yellow', alpha=0.15)
-    ax.axvspan(1, 2, ymin=1/3, ymax=2/3, color='yellow', alpha=0.15)
-    ax.axvspan(0, 1, ymin=2/3, ymax=1, color='yellow', alpha=0.15)
-    # Low-Medium Risk (Green)
-    ax.axvspan(1, 2, ymin=0, ymax=1/3, color='green', alpha=0.15)
-    ax.axvspan(0, 1, ymin=1/3, ymax=2/3, color='green', alpha=0.15)
-    # Low Risk (Light Green)
-    ax.axvspan(0, 1, ymin=0, ymax=1/3, color='lightgreen',
-               alpha=0.15, label='Low Risk')
-
-    ax.set_xticks([0.5, 1.5, 2.5])
-    ax.set_xticklabels(likelihood_order)
-    ax.set_yticks([0.5, 1.5, 2.5])
-    ax.set_yticklabels(impact_order)
-    ax.set_xlabel("Likelihood")
-    ax.set_ylabel("Potential Impact")
-    ax.set_title("AI Model Risk Matrix: Credit Risk Scoring Model")
-
     # Annotate points with Risk ID
-    for i, row in risk_df_plot.iterrows():
-        ax.annotate(row["Risk ID"], (row["Likelihood_Num"] +
-                    0.1, row["Impact_Num"] + 0.1), fontsize=8)
+    for risk_id, x, y in zip(risk_df_plot["Risk ID"].to_numpy(),
+                             risk_df_plot["Likelihood_Num"].to_numpy() + 0.1,
+                             risk_df_plot["Impact_Num"].to_numpy() + 0.1):
+        ax.annotate(risk_id, (x, y), fontsize=8)
 
-    ax.grid(False)  # Remove default grid to avoid overlap with custom lines
-    ax.set_xlim(0, 3)
-    ax.set_ylim(0, 3)
-    st.pyplot(fig)
+    ax.set_xlim(0, len(scale.likelihood_levels))
+    ax.set_ylim(0, len(scale.impact_levels))
+    return crop
 
 
 def add_mitigation_strategy(risk_id, strategy_description, responsible_party):
-    idx = st.session_state.risk_register_df[st.session_state.risk_register_df["Risk ID"] == risk_id].index
-    if not idx.empty:
-        idx = idx[0]
-        st.session_state.risk_register_df.loc[idx,
-                                              "Mitigation Strategy"] = strategy_description
-        st.session_state.risk_register_df.loc[idx,
-                                              "Responsible Party"] = responsible_party
-        st.session_state.risk_register_df.loc[idx,
-                                              "Status"] = "Mitigation Proposed"
-        st.success(f"Mitigation strategy added for Risk {risk_id}.")
-    else:
-        st.error(f"Risk ID {risk_id} not found.")
+    try:
+        st.session_state.risk_register.mitigate(
+            risk_id, strategy_description, responsible_party)
+    except RiskRegisterError as e:
+        st.error(str(e))
+        return
+    st.success(f"Mitigation strategy added for Risk {risk_id}.")
 
 
-def generate_risk_register_report(risk_df):
-    final_columns = [
-        "Risk ID", "Dimension", "Category", "Description",
-        "Potential Impact", "Likelihood", "Risk Score",
-        "Mitigation Strategy", "Responsible Party", "Status"
-    ]
+def add_mitigations_bulk(mitigations):
+    """Apply many mitigation strategies as one all-or-nothing update.
 
-    report_df = risk_df[final_columns].copy()
-    report_df = report_df.sort_values(by="Risk Score", ascending=False)
-    report_df.reset_index(drop=True, inplace=True)
-    return report_df
+    `mitigations` is an iterable of (risk_id, strategy_description,
+    responsible_party) tuples. Returns the number of risks updated.
+    """
+    try:
+        count = st.session_state.risk_register.mitigate_many(mitigations)
+    except RiskRegisterError as e:
+        st.error(str(e))
+        return 0
+    st.success(f"Mitigation strategies added for {count} risk(s).")
+    return count
 
 
-def plot_risk_distribution(risk_df):
+def auto_mitigate_risks():
+    """Propose mitigations for every risk the register's rules match, as one update."""
+    try:
+        count = st.session_state.risk_register.auto_mitigate()
+    except RiskRegisterError as e:
+        st.error(str(e))
+        return 0
+    st.success(f"Mitigation strategies proposed by rule for {count} risk(s).")
+    return count
+
+
+def generate_risk_register_report(risk_df=None):
+    """The final register report; defaults to the session's register."""
+    if risk_df is None:
+        return st.session_state.risk_register.report()
+    return build_report(risk_df)
+
+
+def plot_risk_distribution(risk_df, renderer=None):
+    """Show risk counts per dimension, re-rendering only when the data changes.
+
+    `renderer` is as for `plot_risk_matrix`.
+    """
     if risk_df.empty:
         st.info("No risks identified yet for distribution plot.")
         return
+    renderer = renderer or st.session_state.chart_renderer
+    key = _frame_cache_key(risk_df)
+    if renderer == "vega-lite":
+        counts = _cached_chart(("risk_distribution_data",) + key,
+                               lambda: _risk_counts_by_dimension(risk_df).rename_axis(
+                                   "Dimension").reset_index(name="Number of Risks"))
+        st.vega_lite_chart(counts, {
+            "title": "Distribution of Identified Risks Across AI Dimensions",
+            "mark": {"type": "bar", "tooltip": True},
+            "encoding": {
+                "x": {"field": "Dimension", "type": "nominal", "sort": None,
+                      "title": "AI Risk Dimension", "axis": {"labelAngle": -45}},
+                "y": {"field": "Number of Risks", "type": "quantitative"},
+                "color": {"field": "Dimension", "type": "nominal", "sort": None,
+                          "scale": {"scheme": "viridis"}, "legend": None},
+            },
+        }, use_container_width=True)
+        return
+    if renderer != "matplotlib":
+        raise ValueError(f"Unsupported chart renderer '{renderer}'.")
+    _show_cached_chart(("risk_distribution",) + key,
+                       lambda: _render_png(_draw_risk_distribution, risk_df, figsize=(8, 6)))
+
+
+def _risk_counts_by_dimension(risk_df):
+    register = st.session_state.risk_register
+    if register.cache_key(risk_df) is not None:
+        # A current frame of the register: read its maintained rollup
+        risk_counts_by_dimension = register.dimension_counts().sort_values(
+            ascending=False, kind="stable")
+    else:
+        risk_counts_by_dimension = risk_df['Dimension'].value_counts()
+    # Categorical value_counts also lists dimensions with no risks
+    risk_counts_by_dimension = risk_counts_by_dimension[risk_counts_by_dimension > 0]
+    risk_counts_by_dimension.index = risk_counts_by_dimension.index.astype(str)
+    return risk_counts_by_dimension
+
 
-    risk_counts_by_dimension = risk_df['Dimension'].value_counts()
-    fig, ax = plt.subplots(figsize=(8, 6))
+def _draw_risk_distribution(fig, risk_df):
+    risk_counts_by_dimension = _risk_counts_by_dimension(risk_df)
+    ax = fig.subplots()
     sns.barplot(x=risk_counts_by_dimension.index,
                 y=risk_counts_by_dimension.values, palette='viridis', ax=ax)
     ax.set_title('Distribution of Identified Risks Across AI Dimensions')
     ax.set_xlabel('AI Risk Dimension')
     ax.set_ylabel('Number of Risks')
-    plt.xticks(rotation=45, ha='right')
-    st.pyplot(fig)
+    plt.setp(ax.get_xticklabels(), rotation=45, ha='right')